@@ -5,11 +5,22 @@ class Settings(BaseSettings):
     # MongoDB Configuration
     mongodb_url: str = "mongodb://mongo:27017"
     mongodb_db: str = "newsdiet"
+    mongodb_min_pool_size: int = 5
+    mongodb_max_pool_size: int = 20  # Single-node app; the driver default of 100 is overkill
+    mongodb_server_selection_timeout_ms: int = 5000
+    mongodb_wait_queue_timeout_ms: int = 2500
+    mongodb_compressors: str = "zstd,zlib"  # Wire compression, in order of preference
     
     # Ollama Configuration
     ollama_base_url: str = "http://ollama:11434/v1"
     ollama_model: str = "qwen2.5:3b"
-    ollama_timeout: int = 120
+    ollama_timeout: int = 120  # Read timeout; CPU inference can legitimately take minutes
+    ollama_max_retries: int = 2  # SDK retries on connection errors, timeouts and 5xx
+    ollama_keep_alive: str = "1h"  # How long Ollama keeps the model loaded after a request
+    ai_content_tokens: int = 250  # Approximate token budget for article content in the prompt
+    ai_concurrency: int = 4  # Max concurrent requests sent to Ollama
+    ai_article_timeout: int = 300  # Max seconds one analysis holds an Ollama slot, retries included
+    ai_cache_ttl: int = 30 * 24 * 3600  # Seconds an AI result is reused for identical content
     
     # Application Configuration
     app_host: str = "0.0.0.0"
@@ -18,6 +29,7 @@ class Settings(BaseSettings):
     
     # RSS Fetch Configuration
     rss_fetch_interval_hours: int = 1
+    feed_concurrency: int = 6  # Feeds fetched in parallel
     
     # Feed Management
     delete_articles_on_feed_removal: bool = True
@@ -1,4 +1,6 @@
+import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from app.config import settings
 import logging
 
@@ -8,68 +10,168 @@ logger = logging.getLogger(__name__)
 client: AsyncIOMotorClient | None = None
 db: AsyncIOMotorDatabase | None = None
 
+# Background index creation task (kept referenced so it isn't garbage collected)
+_index_task: asyncio.Task | None = None
+
 
 async def connect_to_mongo() -> None:
-    global client, db
+    global client, db, _index_task
     
     try:
-        client = AsyncIOMotorClient(settings.mongodb_url)
+        # No startup ping: the pool warms up to min_pool_size in the background
+        # and the first real query establishes connectivity.
+        client = AsyncIOMotorClient(
+            settings.mongodb_url,
+            minPoolSize=settings.mongodb_min_pool_size,
+            maxPoolSize=settings.mongodb_max_pool_size,
+            serverSelectionTimeoutMS=settings.mongodb_server_selection_timeout_ms,
+            waitQueueTimeoutMS=settings.mongodb_wait_queue_timeout_ms,
+            compressors=settings.mongodb_compressors
+        )
         db = client[settings.mongodb_db]
+        logger.info(f"MongoDB client configured for {settings.mongodb_url}")
         
-        # Test connection
-        await client.admin.command('ping')
-        logger.info(f"Connected to MongoDB at {settings.mongodb_url}")
-        
-        # Create indexes
-        await create_indexes()
+        # Create indexes concurrently with the rest of app startup
+        _index_task = asyncio.create_task(_create_indexes_in_background())
         
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
         raise
 
 
+async def _create_indexes_in_background() -> None:
+    try:
+        await create_indexes()
+    except Exception as e:
+        logger.error(f"Failed to create database indexes: {e}")
+
+
 async def close_mongo_connection() -> None:
     global client
     
+    if _index_task and not _index_task.done():
+        _index_task.cancel()
+    
     if client:
         client.close()
         logger.info("Closed MongoDB connection")
 
 
+# Article indexes earlier versions created that the declared ones replace; these are
+# the only indexes index sync ever drops (matched by key spec, whatever their name)
+_LEGACY_ARTICLE_INDEXES = [
+    IndexModel([("is_read", ASCENDING), ("published_at", DESCENDING), ("relevance_score", DESCENDING)]),
+    IndexModel([("is_read", ASCENDING), ("relevance_score", DESCENDING)]),
+    IndexModel([("is_starred", ASCENDING), ("published_at", DESCENDING)]),
+    IndexModel([("source", ASCENDING)]),
+    IndexModel([("is_hidden", ASCENDING), ("published_at", DESCENDING)]),
+    IndexModel([("published_at", DESCENDING)], partialFilterExpression={"is_hidden": False}),
+]
+
+
 async def create_indexes() -> None:
     if db is None:
         return
     
     # Articles collection indexes
-    # CRITICAL: Unique index on URL prevents duplicate articles across all feeds
-    await db.articles.create_index("url", unique=True)
+    article_indexes = [
+        # CRITICAL: Unique index on URL prevents duplicate articles across all feeds
+        IndexModel([("url", ASCENDING)], unique=True),
+        
+        # Partial indexes only cover the documents the dashboard actually filters on,
+        # keeping the index working set small as read articles accumulate.
+        # Default and Unread views: filter by unread (+ relevance score), sort by date
+        IndexModel(
+            [("published_at", DESCENDING), ("relevance_score", DESCENDING)],
+            partialFilterExpression={"is_read": False},
+            name="unread_by_date_score"
+        ),
+        
+        # Count unread articles: filter by unread + relevance score (no sort)
+        IndexModel(
+            [("relevance_score", DESCENDING)],
+            partialFilterExpression={"is_read": False},
+            name="unread_by_score"
+        ),
+        
+        # Starred view: filter by starred, sort by date
+        IndexModel(
+            [("published_at", DESCENDING)],
+            partialFilterExpression={"is_starred": True},
+            name="starred_by_date"
+        ),
+        
+        # Sorting by date only (All view)
+        IndexModel([("published_at", DESCENDING)]),
+        
+        # For cleanup task: old unstarred articles (match cleanup_old_articles filter on created_at)
+        IndexModel([("is_starred", ASCENDING), ("created_at", ASCENDING)]),
+        
+        # Feed removal: batched deletes walk a feed's articles in _id order
+        IndexModel([("source", ASCENDING), ("_id", ASCENDING)]),
+    ]
     
-    # Combined indexes for dashboard filtering and sorting
-    # Default view: filter by unread + relevance score, sort by date
-    await db.articles.create_index([("is_read", 1), ("published_at", -1), ("relevance_score", -1)])
+    # Feeds collection indexes
+    feed_indexes = [
+        IndexModel([("url", ASCENDING)], unique=True),
+        IndexModel([("enabled", ASCENDING)]),
+        IndexModel([("name", ASCENDING)]),
+    ]
     
-    # Count unread articles: filter by unread + relevance score (no sort)
-    await db.articles.create_index([("is_read", 1), ("relevance_score", -1)])
+    # AI result cache: expire entries so the cache doesn't grow unbounded
+    ai_cache_indexes = [
+        IndexModel([("ts", ASCENDING)], expireAfterSeconds=settings.ai_cache_ttl),
+    ]
     
-    # Starred view: filter by starred, sort by date
-    await db.articles.create_index([("is_starred", 1), ("published_at", -1)])
+    created = await _sync_indexes(db.articles, article_indexes, _LEGACY_ARTICLE_INDEXES)
+    created += await _sync_indexes(db.feeds, feed_indexes)
+    created += await _sync_indexes(db.ai_cache, ai_cache_indexes)
     
-    # Sorting by date only (All view)
-    await db.articles.create_index([("published_at", -1)])
+    if created:
+        logger.info(f"Database indexes created successfully ({created} new)")
+    else:
+        logger.info("Database indexes already up to date")
+
+
+async def _sync_indexes(
+    collection,
+    models: list[IndexModel],
+    legacy: list[IndexModel] | None = None
+) -> int:
+    """
+    Bring a collection's indexes in line with the declared models.
     
-    # For cleanup task: old unstarred articles (match cleanup_old_articles filter on created_at)
-    await db.articles.create_index([("is_starred", 1), ("created_at", 1)])
+    Indexes are compared by key spec and partial filter, not by name, so an
+    equivalent index created under another name counts as present. Missing
+    indexes are created in a single round-trip. Only indexes matching one of
+    the legacy models are dropped; any other index is left alone. Returns how
+    many indexes were created.
+    """
+    existing = await collection.index_information()
     
-    # Other useful indexes
-    await db.articles.create_index("source")
-    await db.articles.create_index([("is_hidden", 1), ("published_at", -1)])
+    for name, info in existing.items():
+        if any(_same_index(info, m) for m in legacy or []):
+            await collection.drop_index(name)
+            logger.info(f"Dropped legacy index {collection.name}.{name}")
     
-    # Feeds collection indexes
-    await db.feeds.create_index("url", unique=True)
-    await db.feeds.create_index("enabled")
-    await db.feeds.create_index("name")
+    missing = [
+        m for m in models
+        if not any(_same_index(info, m) for info in existing.values())
+    ]
+    if not missing:
+        return 0
     
-    logger.info("Database indexes created successfully")
+    await collection.create_indexes(missing)
+    return len(missing)
+
+
+def _same_index(info: dict, model: IndexModel) -> bool:
+    """Whether an index_information() entry has the model's key spec and partial filter."""
+    document = model.document
+    return (
+        list(info["key"]) == list(document["key"].items())
+        and info.get("partialFilterExpression") == document.get("partialFilterExpression")
+    )
 
 
 def get_database() -> AsyncIOMotorDatabase:
@@ -1,11 +1,18 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
+import re
+import time
 from datetime import datetime, timezone
 from bson import ObjectId
-from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from pydantic import TypeAdapter
 import logging
 
 from app.config import settings
@@ -15,7 +22,7 @@ from app.models import (
     PreferencesUpdate, PreferencesResponse,
     ArticleResponse, UserPreferences
 )
-from app.services.ai_processor import ai_processor
+from app.services.ai_processor import FALLBACK_SUMMARIES, ai_processor
 from app.services.scheduler import start_scheduler, shutdown_scheduler
 from app.services.feeder import rss_feeder
 
@@ -57,6 +64,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down News Diet application")
     shutdown_scheduler()
+    await ai_processor.aclose()
     await close_mongo_connection()
 
 
@@ -68,13 +76,109 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Fields rendered by the dashboard template (skips large bodies like full_text).
+# The server stringifies _id into "id" so handlers don't have to.
+DASHBOARD_ARTICLE_FIELDS = {
+    "_id": 0, "id": {"$toString": "$_id"},
+    "title": 1, "summary": 1, "source": 1, "url": 1, "published_at": 1,
+    "tags": 1, "is_read": 1, "is_starred": 1, "is_hidden": 1, "relevance_score": 1
+}
+
+# Fields needed to build a FeedResponse (also everything feeds.html renders)
+FEED_RESPONSE_FIELDS = {
+    "_id": 0, "id": {"$toString": "$_id"},
+    "url": 1, "name": 1, "enabled": 1, "last_fetched_at": 1, "error_count": 1, "created_at": 1
+}
+
+# Number of articles removed per delete_many when a feed is deleted
+FEED_DELETE_BATCH_SIZE = 1000
+
+# Validator for get_feeds results (documents already carry a string "id")
+FEED_LIST_ADAPTER = TypeAdapter(list[FeedResponse])
+
+# Number of article updates sent per bulk_write during score recalculation
+RECALCULATE_BATCH_SIZE = 500
+# Number of articles read from the cursor and scored concurrently at a time
+RECALCULATE_TASK_BATCH_SIZE = 100
+# Documents returned per cursor round-trip during score recalculation
+RECALCULATE_CURSOR_BATCH_SIZE = 200
+
 # Setup Jinja2 templates
 templates = Jinja2Templates(directory="app/templates")
+# Persist compiled template bytecode across restarts (per-user temp directory)
+templates.env.bytecode_cache = FileSystemBytecodeCache()
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 
+# ============================================
+# Helpers
+# ============================================
+
+def parse_object_id(value: str, kind: str) -> ObjectId:
+    """Convert a path parameter to an ObjectId or raise a 400 naming the resource kind."""
+    # is_valid avoids raising and unwinding InvalidId on the hot path
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail=f"Invalid {kind} ID format")
+    return ObjectId(value)
+
+
+# ============================================
+# In-process Caches
+# ============================================
+
+# Preferences only change when the user saves them, so page renders reuse
+# an in-process copy instead of re-reading the document on every request.
+PREFERENCES_CACHE_TTL = 30  # seconds
+
+# (preferences document or None, monotonic time it was fetched)
+_prefs_cache: tuple[dict | None, float] | None = None
+
+
+async def get_prefs_cached(db: AsyncIOMotorDatabase, ttl: float = PREFERENCES_CACHE_TTL) -> dict | None:
+    global _prefs_cache
+    
+    if _prefs_cache is not None and time.monotonic() - _prefs_cache[1] < ttl:
+        prefs = _prefs_cache[0]
+    else:
+        prefs = await db.preferences.find_one()
+        _prefs_cache = (prefs, time.monotonic())
+    
+    # Shallow copy so callers can add template-only keys without touching the cache
+    return dict(prefs) if prefs is not None else None
+
+
+def invalidate_prefs_cache() -> None:
+    global _prefs_cache
+    _prefs_cache = None
+    rss_feeder.invalidate_prefs()
+
+
+# The "All" view indicator is an approximate count anyway; refreshing it
+# every few seconds is plenty.
+TOTAL_COUNT_CACHE_TTL = 10  # seconds
+
+# (estimated article count, monotonic time it was fetched)
+_total_count_cache: tuple[int, float] | None = None
+
+
+async def get_total_count_cached(db: AsyncIOMotorDatabase, ttl: float = TOTAL_COUNT_CACHE_TTL) -> int:
+    global _total_count_cache
+    
+    if _total_count_cache is not None and time.monotonic() - _total_count_cache[1] < ttl:
+        return _total_count_cache[0]
+    
+    total = await db.articles.estimated_document_count()
+    _total_count_cache = (total, time.monotonic())
+    return total
+
+
+def invalidate_total_count_cache() -> None:
+    global _total_count_cache
+    _total_count_cache = None
+
+
 # ============================================
 # Initialization Functions
 # ============================================
@@ -89,7 +193,7 @@ async def initialize_default_feeds():
 
 async def initialize_default_preferences():
     db = get_database()
-    prefs = await db.preferences.find_one()
+    prefs = await get_prefs_cached(db)
     
     if prefs is None:
         logger.info("Initializing default user preferences")
@@ -103,6 +207,7 @@ async def initialize_default_preferences():
         }
         
         await db.preferences.insert_one(default_prefs)
+        invalidate_prefs_cache()
         logger.info("Default preferences created")
 
 
@@ -110,12 +215,37 @@ async def initialize_default_preferences():
 # Frontend Routes (HTML)
 # ============================================
 
-@app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, show_all: bool = False, filter_unread: bool = False, filter_starred: bool = False):
-    db = get_database()
+async def _count_unread_and_starred(db, min_score: int) -> tuple[int, int]:
+    """Count relevant unread and starred articles in a single aggregation round-trip."""
+    unread_filter = {"is_read": False, "relevance_score": {"$gte": min_score}}
+    starred_filter = {"is_starred": True}
+    
+    # The leading $or lets each branch use its own index before $facet splits the counts
+    pipeline = [
+        {"$match": {"$or": [unread_filter, starred_filter]}},
+        {"$facet": {
+            "unread": [{"$match": unread_filter}, {"$count": "n"}],
+            "starred": [{"$match": starred_filter}, {"$count": "n"}]
+        }}
+    ]
+    results = await db.articles.aggregate(pipeline).to_list(length=1)
+    counts = results[0] if results else {}
     
-    # Get user preferences for min_relevance_score
-    prefs = await db.preferences.find_one()
+    unread = counts.get("unread") or [{"n": 0}]
+    starred = counts.get("starred") or [{"n": 0}]
+    return unread[0]["n"], starred[0]["n"]
+
+
+@app.get("/", response_class=HTMLResponse)
+async def dashboard(
+    request: Request,
+    show_all: bool = False,
+    filter_unread: bool = False,
+    filter_starred: bool = False,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    # Get user preferences for min_relevance_score (the remaining queries depend on it)
+    prefs = await get_prefs_cached(db)
     min_score = prefs.get("min_relevance_score", 5) if prefs else 5
     dark_mode = prefs.get("dark_mode", False) if prefs else False
     
@@ -134,21 +264,15 @@ async def dashboard(request: Request, show_all: bool = False, filter_unread: boo
         query = {"relevance_score": {"$gte": min_score}, "is_read": False}
     
     # Get articles sorted by published date (newest first)
-    cursor = db.articles.find(query).sort("published_at", -1).limit(100)
-    articles = await cursor.to_list(length=100)
-    
-    # Convert ObjectId to string for template
-    for article in articles:
-        article["id"] = str(article["_id"])
-    
-    # Get unread count (only relevant articles)
-    unread_count = await db.articles.count_documents({"is_read": False, "relevance_score": {"$gte": min_score}})
-    
-    # Get starred count
-    starred_count = await db.articles.count_documents({"is_starred": True})
-    
-    # Get total articles count (fast estimated count for "All" view indicator)
-    total_count = await db.articles.estimated_document_count()
+    cursor = db.articles.find(query, DASHBOARD_ARTICLE_FIELDS).sort("published_at", -1).limit(100)
+    
+    # Articles, sidebar counts and total count are independent; overlap their round-trips
+    articles, (unread_count, starred_count), total_count = await asyncio.gather(
+        cursor.to_list(length=100),
+        _count_unread_and_starred(db, min_score),
+        # Fast estimated count for "All" view indicator
+        get_total_count_cached(db)
+    )
     
     return templates.TemplateResponse(
         "index.html",
@@ -168,18 +292,14 @@ async def dashboard(request: Request, show_all: bool = False, filter_unread: boo
 
 
 @app.get("/feeds", response_class=HTMLResponse)
-async def feeds_page(request: Request):
-    db = get_database()
-    
-    cursor = db.feeds.find().sort("name", 1)
-    feeds = await cursor.to_list(length=100)
-    
-    # Convert ObjectId to string
-    for feed in feeds:
-        feed["id"] = str(feed["_id"])
+async def feeds_page(request: Request, db: AsyncIOMotorDatabase = Depends(get_database)):
+    # Feeds and dark mode preference are independent; fetch them concurrently
+    cursor = db.feeds.find({}, FEED_RESPONSE_FIELDS).sort("name", 1)
+    feeds, prefs = await asyncio.gather(
+        cursor.to_list(length=100),
+        get_prefs_cached(db)
+    )
     
-    # Get dark mode preference
-    prefs = await db.preferences.find_one()
     dark_mode = prefs.get("dark_mode", False) if prefs else False
     
     return templates.TemplateResponse(
@@ -193,10 +313,8 @@ async def feeds_page(request: Request):
 
 
 @app.get("/preferences", response_class=HTMLResponse)
-async def preferences_page(request: Request):
-    db = get_database()
-    
-    prefs = await db.preferences.find_one()
+async def preferences_page(request: Request, db: AsyncIOMotorDatabase = Depends(get_database)):
+    prefs = await get_prefs_cached(db)
     
     if prefs:
         prefs["id"] = str(prefs["_id"])
@@ -226,20 +344,17 @@ async def preferences_page(request: Request):
 
 
 @app.get("/reader/{article_id}", response_class=HTMLResponse)
-async def reader_page(request: Request, article_id: str):
-    db = get_database()
-    
-    try:
-        oid = ObjectId(article_id)
-    except InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid article ID format")
+async def reader_page(request: Request, article_id: str, db: AsyncIOMotorDatabase = Depends(get_database)):
+    oid = parse_object_id(article_id, "article")
     
-    article = await db.articles.find_one({"_id": oid})
+    # Article and dark mode preference are independent; fetch them concurrently
+    article, prefs = await asyncio.gather(
+        db.articles.find_one({"_id": oid}),
+        get_prefs_cached(db)
+    )
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     
-    # Get dark mode preference
-    prefs = await db.preferences.find_one()
     dark_mode = prefs.get("dark_mode", False) if prefs else False
     
     # Mark as read when opening in reader mode
@@ -285,21 +400,19 @@ async def refresh_articles():
 
 
 @app.patch("/api/articles/{article_id}/read")
-async def mark_article_read(article_id: str, is_read: bool = True):
-    db = get_database()
+async def mark_article_read(article_id: str, is_read: bool = True, db: AsyncIOMotorDatabase = Depends(get_database)):
+    oid = parse_object_id(article_id, "article")
     
     try:
-        oid = ObjectId(article_id)
-    except InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid article ID format")
-    
-    try:
-        result = await db.articles.update_one(
+        # Existence check and update in a single round-trip; None means no such article
+        result = await db.articles.find_one_and_update(
             {"_id": oid},
-            {"$set": {"is_read": is_read}}
+            {"$set": {"is_read": is_read}},
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if result is None:
             raise HTTPException(status_code=404, detail="Article not found")
         
         return {"success": True, "is_read": is_read}
@@ -312,21 +425,19 @@ async def mark_article_read(article_id: str, is_read: bool = True):
 
 
 @app.patch("/api/articles/{article_id}/star")
-async def toggle_article_star(article_id: str, is_starred: bool = True):
-    db = get_database()
-    
-    try:
-        oid = ObjectId(article_id)
-    except InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid article ID format")
+async def toggle_article_star(article_id: str, is_starred: bool = True, db: AsyncIOMotorDatabase = Depends(get_database)):
+    oid = parse_object_id(article_id, "article")
     
     try:
-        result = await db.articles.update_one(
+        # Existence check and update in a single round-trip; None means no such article
+        result = await db.articles.find_one_and_update(
             {"_id": oid},
-            {"$set": {"is_starred": is_starred}}
+            {"$set": {"is_starred": is_starred}},
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if result is None:
             raise HTTPException(status_code=404, detail="Article not found")
         
         return {"success": True, "is_starred": is_starred}
@@ -343,36 +454,21 @@ async def toggle_article_star(article_id: str, is_starred: bool = True):
 # ============================================
 
 @app.get("/api/feeds", response_model=list[FeedResponse])
-async def get_feeds():
-    db = get_database()
-    
-    cursor = db.feeds.find().sort("name", 1)
+async def get_feeds(db: AsyncIOMotorDatabase = Depends(get_database)):
+    cursor = db.feeds.find({}, FEED_RESPONSE_FIELDS).sort("name", 1)
     feeds = await cursor.to_list(length=100)
     
-    # Convert to response model
-    return [
-        FeedResponse(
-            id=str(feed["_id"]),
-            url=feed["url"],
-            name=feed["name"],
-            enabled=feed["enabled"],
-            last_fetched_at=feed.get("last_fetched_at"),
-            error_count=feed.get("error_count", 0),
-            created_at=feed["created_at"]
-        )
-        for feed in feeds
-    ]
+    # Validate the whole list in one pydantic-core pass instead of per-item construction
+    return FEED_LIST_ADAPTER.validate_python(feeds)
 
 
 @app.post("/api/feeds", response_model=FeedResponse)
-async def create_feed(feed: FeedCreate):
-    db = get_database()
-    
+async def create_feed(feed: FeedCreate, db: AsyncIOMotorDatabase = Depends(get_database)):
     # Convert HttpUrl to string for storage
     feed_url = str(feed.url)
     
     # Check if feed already exists
-    existing = await db.feeds.find_one({"url": feed_url})
+    existing = await db.feeds.find_one({"url": feed_url}, {"_id": 1})
     if existing:
         raise HTTPException(status_code=400, detail="Feed already exists")
     
@@ -399,13 +495,8 @@ async def create_feed(feed: FeedCreate):
 
 
 @app.patch("/api/feeds/{feed_id}")
-async def update_feed(feed_id: str, feed_update: FeedUpdate):
-    db = get_database()
-    
-    try:
-        oid = ObjectId(feed_id)
-    except InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid feed ID format")
+async def update_feed(feed_id: str, feed_update: FeedUpdate, db: AsyncIOMotorDatabase = Depends(get_database)):
+    oid = parse_object_id(feed_id, "feed")
     
     update_data = {k: v for k, v in feed_update.model_dump(exclude_unset=True).items()}
     
@@ -423,14 +514,24 @@ async def update_feed(feed_id: str, feed_update: FeedUpdate):
     return {"success": True}
 
 
+async def _delete_articles_by_source(db, source: str) -> int:
+    """Delete a feed's articles in _id-ordered batches so no single delete holds the lock for long."""
+    deleted = 0
+    while True:
+        batch = await db.articles.find(
+            {"source": source}, {"_id": 1}
+        ).sort("_id", 1).limit(FEED_DELETE_BATCH_SIZE).to_list(length=FEED_DELETE_BATCH_SIZE)
+        if not batch:
+            return deleted
+        
+        # Range up to the batch's last _id is served by the (source, _id) index
+        result = await db.articles.delete_many({"source": source, "_id": {"$lte": batch[-1]["_id"]}})
+        deleted += result.deleted_count
+
+
 @app.delete("/api/feeds/{feed_id}")
-async def delete_feed(feed_id: str):
-    db = get_database()
-    
-    try:
-        oid = ObjectId(feed_id)
-    except InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid feed ID format")
+async def delete_feed(feed_id: str, db: AsyncIOMotorDatabase = Depends(get_database)):
+    oid = parse_object_id(feed_id, "feed")
     
     # First, get the feed to retrieve its name (needed for article deletion)
     feed = await db.feeds.find_one({"_id": oid})
@@ -446,8 +547,8 @@ async def delete_feed(feed_id: str):
     if settings.delete_articles_on_feed_removal:
         feed_name = feed.get("name", "")
         if feed_name:
-            articles_result = await db.articles.delete_many({"source": feed_name})
-            deleted_articles_count = articles_result.deleted_count
+            deleted_articles_count = await _delete_articles_by_source(db, feed_name)
+            invalidate_total_count_cache()
             logger.info(f"Deleted {deleted_articles_count} articles from feed '{feed_name}'")
     
     return {
@@ -461,10 +562,8 @@ async def delete_feed(feed_id: str):
 # ============================================
 
 @app.get("/api/preferences", response_model=PreferencesResponse)
-async def get_preferences():
-    db = get_database()
-    
-    prefs = await db.preferences.find_one()
+async def get_preferences(db: AsyncIOMotorDatabase = Depends(get_database)):
+    prefs = await get_prefs_cached(db)
     
     if prefs is None:
         # Return defaults
@@ -488,9 +587,7 @@ async def get_preferences():
 
 
 @app.put("/api/preferences")
-async def update_preferences(prefs_update: PreferencesUpdate):
-    db = get_database()
-    
+async def update_preferences(prefs_update: PreferencesUpdate, db: AsyncIOMotorDatabase = Depends(get_database)):
     update_data = {k: v for k, v in prefs_update.model_dump(exclude_unset=True).items()}
     update_data["updated_at"] = datetime.now(timezone.utc)
     
@@ -500,16 +597,16 @@ async def update_preferences(prefs_update: PreferencesUpdate):
         {"$set": update_data},
         upsert=True
     )
+    invalidate_prefs_cache()
     
     return {"success": True}
 
 
 @app.delete("/api/articles")
-async def delete_all_articles():
-    db = get_database()
-    
+async def delete_all_articles(db: AsyncIOMotorDatabase = Depends(get_database)):
     try:
         result = await db.articles.delete_many({})
+        invalidate_total_count_cache()
         logger.info(f"Deleted all articles. Count: {result.deleted_count}")
         return {
             "success": True,
@@ -521,13 +618,93 @@ async def delete_all_articles():
         raise HTTPException(status_code=500, detail="Failed to delete articles")
 
 
-@app.post("/api/articles/recalculate")
-async def recalculate_all_scores():
-    db = get_database()
+def _compile_topic_pattern(topics: list[str]) -> re.Pattern | None:
+    """Build one case-insensitive whole-word pattern matching any of the topics."""
+    terms = [re.escape(t.strip()) for t in topics if t.strip()]
+    if not terms:
+        return None
+    # Lookarounds instead of \b so topics starting or ending in symbols (C++, C#, .NET) match
+    return re.compile(r"(?<!\w)(?:" + "|".join(terms) + r")(?!\w)", re.IGNORECASE)
+
+
+def _prefilter_article(
+    article: dict,
+    exclude_re: re.Pattern | None,
+    min_score: int
+) -> UpdateOne | None:
+    """
+    Keyword pre-filter that skips the LLM when an article's score is predictable.
+    
+    Only an excluded topic in the title is predictable: it scores 0, the same as
+    the AI's EXCLUDED verdict, and the existing summary is kept. A missing interest
+    keyword says nothing about the AI's semantic tags, so everything else returns
+    None and goes to the AI, as do articles that only hold a fallback summary.
+    """
+    if article.get("summary") in FALLBACK_SUMMARIES:
+        return None
+    
+    if not exclude_re or not exclude_re.search(article.get("title", "")):
+        return None
+    
+    score = 0
+    return UpdateOne(
+        {"_id": article["_id"]},
+        {"$set": {"tags": [], "relevance_score": score, "is_hidden": score < min_score}}
+    )
+
+
+async def _rescore_article(
+    article: dict,
+    preferences: UserPreferences
+) -> UpdateOne | None:
+    """Re-run AI processing for one article and return its update, or None on failure."""
+    try:
+        # Use the process_article method which handles both summary and scoring
+        result = await ai_processor.process_article(
+            article.get("title", ""),
+            article.get("summary", "") or article.get("full_text", ""),
+            preferences
+        )
+    except Exception as e:
+        logger.error(f"Error processing article {article.get('_id')}: {e}")
+        return None
+    
+    # Determine if article should be hidden based on new relevance score
+    is_hidden = result["relevance_score"] < preferences.min_relevance_score if result["relevance_score"] is not None else False
+    
+    return UpdateOne(
+        {"_id": article["_id"]},
+        {"$set": {
+            "summary": result["summary"],
+            "tags": result["tags"],
+            "relevance_score": result["relevance_score"],
+            "is_hidden": is_hidden
+        }}
+    )
+
+
+async def _flush_article_updates(db, operations: list[UpdateOne]) -> int:
+    """Apply queued article updates in one unordered bulk write. Returns matched count."""
+    if not operations:
+        return 0
     
+    try:
+        result = await db.articles.bulk_write(operations, ordered=False)
+        return result.matched_count
+    except BulkWriteError as e:
+        # Unordered: the rest of the batch is still applied
+        logger.error(f"Bulk article update partially failed: {len(e.details.get('writeErrors', []))} errors")
+        return e.details.get("nMatched", 0)
+    except Exception as e:
+        logger.error(f"Bulk article update failed: {e}")
+        return 0
+
+
+@app.post("/api/articles/recalculate")
+async def recalculate_all_scores(db: AsyncIOMotorDatabase = Depends(get_database)):
     try:
         # Get user preferences
-        prefs_doc = await db.preferences.find_one()
+        prefs_doc = await get_prefs_cached(db)
         if prefs_doc is None:
             raise HTTPException(status_code=400, detail="User preferences not found. Please configure your preferences first.")
         
@@ -539,41 +716,52 @@ async def recalculate_all_scores():
         )
         
         # Get all articles using a cursor to avoid loading all into memory
-        cursor = db.articles.find({})
-        
-        # Process articles one by one with proper error handling
-        from app.services.ai_processor import ai_processor
+        # Only fetch the fields the AI processor reads, a couple of scoring batches per round-trip
+        cursor = db.articles.find(
+            {}, {"title": 1, "summary": 1, "full_text": 1}
+        ).batch_size(RECALCULATE_CURSOR_BATCH_SIZE)
         
         processed = 0
+        pending_updates: list[UpdateOne] = []
+        batch: list[dict] = []
+        
+        # The pre-filter pattern is compiled once for the whole pass
+        exclude_re = _compile_topic_pattern(preferences.exclude_topics)
+        prefiltered = 0
+        
+        async def rescore_batch(articles: list[dict]):
+            nonlocal processed, pending_updates, prefiltered
+            to_score = []
+            for article in articles:
+                update = _prefilter_article(article, exclude_re, preferences.min_relevance_score)
+                if update is None:
+                    to_score.append(article)
+                else:
+                    pending_updates.append(update)
+                    prefiltered += 1
+            
+            # Articles in a batch are scored concurrently; AIProcessor bounds the Ollama calls
+            results = await asyncio.gather(
+                *(_rescore_article(article, preferences) for article in to_score)
+            )
+            pending_updates.extend(op for op in results if op is not None)
+            
+            if len(pending_updates) >= RECALCULATE_BATCH_SIZE:
+                processed += await _flush_article_updates(db, pending_updates)
+                pending_updates = []
+        
         async for article in cursor:
-            try:
-                # Use the process_article method which handles both summary and scoring
-                result = await ai_processor.process_article(
-                    article.get("title", ""),
-                    article.get("summary", "") or article.get("full_text", ""),
-                    preferences
-                )
-                
-                # Determine if article should be hidden based on new relevance score
-                is_hidden = result["relevance_score"] < preferences.min_relevance_score if result["relevance_score"] is not None else False
-                
-                # Update article with new data
-                await db.articles.update_one(
-                    {"_id": article["_id"]},
-                    {"$set": {
-                        "summary": result["summary"],
-                        "tags": result["tags"],
-                        "relevance_score": result["relevance_score"],
-                        "is_hidden": is_hidden
-                    }}
-                )
-                processed += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing article {article.get('_id')}: {e}")
-                continue
+            batch.append(article)
+            if len(batch) >= RECALCULATE_TASK_BATCH_SIZE:
+                await rescore_batch(batch)
+                batch = []
         
-        logger.info(f"Recalculated scores for {processed} articles")
+        if batch:
+            await rescore_batch(batch)
+        
+        processed += await _flush_article_updates(db, pending_updates)
+        
+        logger.info(f"Recalculated scores for {processed} articles ({prefiltered} skipped the AI via keyword pre-filter)")
         return {
             "success": True,
             "processed_count": processed,
@@ -591,11 +779,21 @@ async def recalculate_all_scores():
 # Health Check
 # ============================================
 
+# (unix second, ISO timestamp) so frequent health probes reuse the formatted string
+_health_timestamp: tuple[int, str] = (0, "")
+
+
 @app.get("/health")
 async def health_check():
+    global _health_timestamp
+    
+    now = int(time.time())
+    if _health_timestamp[0] != now:
+        _health_timestamp = (now, datetime.fromtimestamp(now, timezone.utc).isoformat())
+    
     return {
         "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": _health_timestamp[1]
     }
 
 
@@ -107,8 +107,8 @@ class FeedResponse(BaseModel):
     url: str
     name: str
     enabled: bool
-    last_fetched_at: datetime | None
-    error_count: int
+    last_fetched_at: datetime | None = None
+    error_count: int = 0
     created_at: datetime
 
 
@@ -1,126 +1,400 @@
 import asyncio
+import hashlib
 import httpx
+from functools import lru_cache
 import logging
+import re
+from datetime import datetime, timezone
 from openai import AsyncOpenAI, APIConnectionError, APITimeoutError
 from app.config import settings
+from app.database import get_database
 from app.models import UserPreferences
 
 logger = logging.getLogger(__name__)
 
+# Preambles small models add despite instructions, e.g. "Here is a summary of the article:"
+_PREAMBLE_RE = re.compile(
+    r"^\s*(?:here(?:'s| is) a summary[^:\n]{0,40}:|this article[^:\n]{0,40}:"
+    r"|the article[^:\n]{0,40}:|summary\s*:)\s*",
+    re.IGNORECASE
+)
+# A sentence ends with . ! or ? followed by whitespace, so decimals like 3.5 don't split
+# (a trailing fragment without punctuation also counts)
+_SENTENCE_RE = re.compile(r"\s*\S.*?(?:[.!?]+(?=\s|$)|$)", re.DOTALL)
+# Sentence-ending punctuation followed by whitespace, for counting during streaming
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s)")
+# First word of a section value, skipping punctuation and markdown emphasis
+_FIRST_WORD_RE = re.compile(r"[^\w\n]*(\w+)")
+# A section label the way models write it: "Tags:", "**Tags:**", "**Tags**:" or "## Tags:"
+_LABEL_PATTERN = r"^[ \t]*[#*_]*[ \t]*{}[ \t]*[*_]*[ \t]*:[ \t]*[*_]*"
+_SECTION_RE = re.compile(_LABEL_PATTERN.format("(Summary|Tags|Quality)"), re.MULTILINE | re.IGNORECASE)
+_SUMMARY_LABEL_RE = re.compile(_LABEL_PATTERN.format("Summary"), re.MULTILINE | re.IGNORECASE)
+# Complete Tags/Quality lines, both required before the response can be cut short
+_TAGS_LINE_RE = re.compile(_LABEL_PATTERN.format("Tags") + r"[^\n]*\n", re.MULTILINE | re.IGNORECASE)
+_QUALITY_LINE_RE = re.compile(
+    _LABEL_PATTERN.format("Quality") + r"[^\n]*\w[^\n]*\n", re.MULTILINE | re.IGNORECASE
+)
+# Rough cost of a character in LLM tokens: ASCII text averages ~4 characters per
+# token, while CJK, emoji and most other non-ASCII characters take ~1 token each
+ASCII_CHARS_PER_TOKEN = 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to an approximate token budget instead of a fixed character count."""
+    if text.isascii():
+        return text[:max_tokens * ASCII_CHARS_PER_TOKEN]
+    
+    budget = max_tokens * ASCII_CHARS_PER_TOKEN
+    for index, char in enumerate(text):
+        budget -= 1 if char.isascii() else ASCII_CHARS_PER_TOKEN
+        if budget < 0:
+            return text[:index]
+    return text
+
+
+# Summaries stored when analysis didn't happen; articles carrying them need the AI again
+SUMMARY_OFFLINE = "Summary unavailable - AI service temporarily offline."
+SUMMARY_FAILED = "Summary generation failed."
+FALLBACK_SUMMARIES = frozenset({SUMMARY_OFFLINE, SUMMARY_FAILED})
+
+
+# Prompt templates; the preference-dependent parts are filled once per
+# preferences by _build_prompts, only the article suffix changes per call
+_SYSTEM_TEMPLATE = (
+    "You are a concise tech news analyst. Only use these exact topics as tags: {interests}. "
+    "Be selective - most articles should get 0-1 tags. Summaries are EXACTLY 4 sentences "
+    "with NO introduction or meta-commentary, ALWAYS in the same language as the input article."
+)
+_PROMPT_PREFIX_TEMPLATE = """Analyze this news article for a reader interested in: {interests}
+Topics to AVOID: {excludes}
+
+Your tasks:
+1. Identify which topics from the interest list this article is CLEARLY about (main focus, not just mentioned)
+2. Assess the article quality: low, medium, or high
+3. Summarize the article in EXACTLY 4 informative sentences with only the key facts and main points
+
+Available topics: {interests}
+
+Article:
+"""
+_ARTICLE_PROMPT_SUFFIX = """Title: {title}
+Content: {content}
+
+IMPORTANT:
+- Only tag topics that are a PRIMARY focus of the article
+- If article is about excluded topics, return EXCLUDED
+- Return 0-3 tags maximum
+- Most articles should have 0-1 tags
+- Write the summary in the SAME LANGUAGE as the original article
+- NO PREAMBLE like "Here is a summary". Start the summary directly
+- DO NOT exceed 4 sentences in the summary
+
+Format:
+Tags: [tag1, tag2] OR Tags: [] OR Tags: EXCLUDED
+Quality: low OR Quality: medium OR Quality: high
+Summary: <4 sentences>"""
+
+
+@lru_cache(maxsize=32)
+def _build_prompts(interests: tuple[str, ...], exclude_topics: tuple[str, ...]) -> tuple[str, str]:
+    """Return the system message and static prompt prefix for a set of preferences."""
+    interests_str = ", ".join(interests) if interests else "general tech news"
+    exclude_str = ", ".join(exclude_topics) if exclude_topics else "none"
+    return (
+        _SYSTEM_TEMPLATE.format(interests=interests_str),
+        _PROMPT_PREFIX_TEMPLATE.format(interests=interests_str, excludes=exclude_str)
+    )
+
 
 class AIProcessor:
     def __init__(self):
+        # Connecting to a local Ollama should be instant, while generating can be slow,
+        # so only the read timeout is long
+        timeout = httpx.Timeout(connect=10, read=settings.ollama_timeout, write=30, pool=10)
+        # One long-lived pooled client shared by the OpenAI SDK and the Ollama
+        # management calls, so requests reuse keep-alive connections
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30
+            )
+        )
         self.client = AsyncOpenAI(
             base_url=settings.ollama_base_url,
             api_key="not-needed",  # Ollama doesn't require API key
-            timeout=settings.ollama_timeout,
-            http_client=httpx.AsyncClient(timeout=settings.ollama_timeout)
+            timeout=timeout,
+            max_retries=settings.ollama_max_retries,
+            http_client=self._http
         )
         self.model = settings.ollama_model
+        # Caps concurrent Ollama requests across feed fetches and recalculation
+        self._semaphore = asyncio.Semaphore(settings.ai_concurrency)
+    
+    async def aclose(self) -> None:
+        """Release pooled connections on application shutdown."""
+        await self._http.aclose()
     
     async def ensure_model_available(self) -> bool:
         """Check if model is pulled, pull it if not. Returns True if ready."""
         try:
             # Check if model exists via Ollama API
             ollama_url = settings.ollama_base_url.replace("/v1", "")
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(f"{ollama_url}/api/tags")
+            response = await self._http.get(f"{ollama_url}/api/tags", timeout=30)
+            
+            if response.status_code == 200:
+                models_data = response.json()
+                models = models_data.get("models", [])
+                model_names = [m.get("name", "") for m in models]
                 
-                if response.status_code == 200:
-                    models_data = response.json()
-                    models = models_data.get("models", [])
-                    model_names = [m.get("name", "") for m in models]
-                    
-                    if self.model in model_names:
-                        logger.info(f"Model {self.model} is already available")
-                        return True
-                    
-                    # Model not found, trigger pull
-                    logger.info(f"Model {self.model} not found. Starting pull...")
-                    pull_response = await client.post(
-                        f"{ollama_url}/api/pull",
-                        json={"name": self.model},
-                        timeout=600  # Model pull can take several minutes
-                    )
-                    
-                    if pull_response.status_code == 200:
-                        logger.info(f"Successfully pulled model {self.model}")
-                        return True
-                    else:
-                        logger.error(f"Failed to pull model: {pull_response.text}")
-                        return False
+                if self.model in model_names:
+                    logger.info(f"Model {self.model} is already available")
+                    return True
+                
+                # Model not found, trigger pull
+                logger.info(f"Model {self.model} not found. Starting pull...")
+                pull_response = await self._http.post(
+                    f"{ollama_url}/api/pull",
+                    json={"name": self.model},
+                    # Model pull can take many minutes; only bound connecting
+                    timeout=httpx.Timeout(10, read=None)
+                )
+                
+                if pull_response.status_code == 200:
+                    logger.info(f"Successfully pulled model {self.model}")
+                    return True
                 else:
-                    logger.error(f"Failed to check models: {response.status_code}")
+                    logger.error(f"Failed to pull model: {pull_response.text}")
                     return False
-                    
+            else:
+                logger.error(f"Failed to check models: {response.status_code}")
+                return False
+                
         except Exception as e:
             logger.error(f"Error ensuring model availability: {e}")
             return False
     
-    async def summarize_article(self, title: str, content: str) -> str:
-        """Generate exactly 4 informative sentences in the article's original language."""
+    async def warmup(self) -> None:
+        """Load the model into Ollama's memory so the first real request doesn't pay for it."""
         try:
-            prompt = f"""Summarize this news article in EXACTLY 4 informative sentences. 
-Include only the key facts and main points.
-
-IMPORTANT: 
-- Write the summary in the SAME LANGUAGE as the original article.
-- NO PREAMBLE like "Here is a summary". Start directly.
-- DO NOT exceed 4 sentences.
-
-Title: {title}
-Content: {content[:1000]}
-
-Summary:"""
-            
-            response = await self.client.chat.completions.create(
+            await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a concise tech news summarizer. Output EXACTLY 4 sentences. NO introduction or meta-commentary. ALWAYS use the same language as the input article."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=250
+                messages=[{"role": "user", "content": "ok"}],
+                max_tokens=1,
+                extra_body={"keep_alive": settings.ollama_keep_alive}
+            )
+            logger.info(f"Model {self.model} warmed up")
+        except Exception as e:
+            logger.warning(f"Model warmup failed: {e}")
+    
+    async def analyze_article(
+        self,
+        title: str,
+        content: str,
+        preferences: UserPreferences
+    ) -> dict:
+        """
+        Summarize, tag and score an article with a single LLM call.
+        
+        One prompt asks for topic tags, a quality assessment and a 4-sentence
+        summary, so the article content is sent and prefilled once instead of
+        once per task. Tags and quality come first so the summary ends the
+        response.
+        """
+        # Only this excerpt reaches the model, so it is also what the cache keys on
+        content = truncate_to_tokens(content, settings.ai_content_tokens)
+        
+        # Identical content (syndicated copies, /amp/ variants, re-published URLs)
+        # reuses a previous result instead of calling the model again
+        cache_key = self._cache_key(title, content, preferences)
+        cached = await self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            system_message, prompt_prefix = _build_prompts(
+                tuple(preferences.interests), tuple(preferences.exclude_topics)
+            )
+            prompt = prompt_prefix + _ARTICLE_PROMPT_SUFFIX.format(
+                title=title, content=content
             )
             
-            summary = response.choices[0].message.content.strip()
-            
-            # Post-process: remove common preambles if LLM still adds them
-            unwanted_prefixes = [
-                "here is a summary",
-                "here's a summary",
-                "this article",
-                "the article",
-                "summary:",
-            ]
-            summary_lower = summary.lower()
-            for prefix in unwanted_prefixes:
-                if summary_lower.startswith(prefix):
-                    if ':' in summary[:50]:
-                        summary = summary.split(':', 1)[1].strip()
-                    break
-            
-            # Final safety check: if LLM ignored the 4-sentence limit, we take the first 4.
-            # This prevents UI layout shifts.
-            sentences = [s.strip() for s in summary.split('.') if s.strip()]
-            if len(sentences) > 4:
-                summary = '. '.join(sentences[:4]) + '.'
-            
-            return summary
+            # Held only around the model call; cache hits above never take an Ollama slot.
+            # The deadline covers SDK retries too, so one stalled article can't hold a slot
+            # for (max_retries + 1) read timeouts
+            async with self._semaphore, asyncio.timeout(settings.ai_article_timeout):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_message},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.2,
+                    max_tokens=350,
+                    stream=True,
+                    extra_body={"keep_alive": settings.ollama_keep_alive}
+                )
+                
+                result = (await self._read_until_summary_complete(response)).strip()
             
-        except (APIConnectionError, APITimeoutError) as e:
-            logger.warning(f"AI service unavailable for summarization: {e}")
-            return "Summary unavailable - AI service temporarily offline."
+        except (APIConnectionError, APITimeoutError, TimeoutError) as e:
+            logger.warning(f"AI service unavailable for article analysis: {e}")
+            # Default: medium relevance when AI unavailable
+            return {
+                "summary": SUMMARY_OFFLINE,
+                "relevance_score": 5,
+                "tags": []
+            }
         except Exception as e:
-            logger.error(f"Unexpected error summarizing article: {type(e).__name__}: {e}")
-            return "Summary generation failed."
+            logger.error(f"Unexpected error analyzing article: {type(e).__name__}: {e}")
+            return {"summary": SUMMARY_FAILED, "relevance_score": 5, "tags": []}
+        
+        analysis, is_complete = self._parse_response(result, preferences)
+        # An answer missing a section is used for this article but not cached, so a
+        # single bad stream doesn't pin its result to the content for ai_cache_ttl
+        if is_complete:
+            await self._store_cached_result(cache_key, analysis)
+        return analysis
     
-    async def score_relevance(
-        self, 
-        title: str, 
-        content: str, 
-        preferences: UserPreferences
-    ) -> tuple[int, list[str]]:
+    @classmethod
+    def _parse_response(cls, result: str, preferences: UserPreferences) -> tuple[dict, bool]:
+        """
+        Turn the model's Tags/Quality/Summary response, in any section order, into an analysis.
+        
+        Without a Summary label, the text outside the Tags and Quality lines is used
+        as the summary. Also returns whether the response was complete: a non-empty
+        summary plus a Tags line and a recognized Quality value.
+        """
+        # Single pass over the response: ['', 'Tags', ' ...', 'Quality', ' ...', 'Summary', ' ...']
+        parts = _SECTION_RE.split(result)
+        sections = {}
+        unlabeled = [parts[0]]
+        for i in range(1, len(parts) - 1, 2):
+            label, value = parts[i].capitalize(), parts[i + 1]
+            if label != "Summary":
+                # Tags and Quality are one line; anything below them is unlabeled text
+                value, _, rest = value.partition("\n")
+                unlabeled.append(rest)
+            sections[label] = value.strip()
+        
+        tags, is_excluded = cls._parse_tags(sections.get("Tags", ""), preferences)
+        
+        # First word only, so "High." or "**medium**" still count
+        quality_word = _FIRST_WORD_RE.match(sections.get("Quality", ""))
+        quality = quality_word.group(1).lower() if quality_word else ""
+        has_quality = quality in ["low", "medium", "high"]
+        if not has_quality:
+            quality = "medium"  # Default
+        
+        summary = sections.get("Summary")
+        if summary is None:
+            summary = " ".join(text.strip() for text in unlabeled if text.strip())
+        summary = cls._clean_summary(summary)
+        
+        analysis = {
+            "summary": summary,
+            "relevance_score": cls._score(tags, quality, is_excluded),
+            "tags": tags
+        }
+        return analysis, bool(summary) and "Tags" in sections and has_quality
+    
+    def _cache_key(self, title: str, content: str, preferences: UserPreferences) -> str:
+        """Hash everything that influences the model's answer."""
+        key_parts = [
+            self.model,
+            "|".join(preferences.interests),
+            "|".join(preferences.exclude_topics),
+            title,
+            content
+        ]
+        return hashlib.sha256("\x1f".join(key_parts).encode("utf-8")).hexdigest()
+    
+    async def _get_cached_result(self, key: str) -> dict | None:
+        try:
+            # Entries with an empty summary predate the completeness check; treat them as misses
+            return await get_database().ai_cache.find_one(
+                {"_id": key, "summary": {"$ne": ""}}, {"_id": 0, "ts": 0}
+            )
+        except Exception as e:
+            logger.debug(f"AI cache lookup failed: {e}")
+            return None
+    
+    async def _store_cached_result(self, key: str, analysis: dict) -> None:
+        # Only successful analyses are cached; fallbacks must be retried next time
+        try:
+            await get_database().ai_cache.update_one(
+                {"_id": key},
+                {"$set": {**analysis, "ts": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.debug(f"AI cache store failed: {e}")
+    
+    @staticmethod
+    async def _read_until_summary_complete(stream) -> str:
+        """
+        Accumulate a streamed response, stopping once every section is complete.
+        
+        The prompt asks for the summary last, so once Tags and Quality have been seen
+        and the summary has 4 sentences anything further would be discarded anyway;
+        closing the stream early makes Ollama stop decoding. If the model puts the
+        summary first, the stream is read on until the other sections arrive.
+        """
+        text = ""
+        summary_start = -1
+        try:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                text += chunk.choices[0].delta.content
+                
+                if summary_start < 0:
+                    label = _SUMMARY_LABEL_RE.search(text)
+                    summary_start = label.end() if label else -1
+                if (
+                    summary_start >= 0
+                    and len(_SENTENCE_END_RE.findall(text, summary_start)) >= 4
+                    and _TAGS_LINE_RE.search(text)
+                    and _QUALITY_LINE_RE.search(text)
+                ):
+                    break
+        finally:
+            await stream.close()
+        return text
+    
+    @staticmethod
+    def _parse_tags(tags_str: str, preferences: UserPreferences) -> tuple[list[str], bool]:
+        """Return (tags restricted to the user's interests, whether the article is excluded)."""
+        tags_str = tags_str.split("\n", 1)[0].strip()
+        
+        if tags_str.upper() == "EXCLUDED":
+            return [], True
+        if tags_str.lower() in ["none", "n/a", "na", "[]", ""]:
+            return [], False
+        
+        raw_tags = [t.strip().strip("[]\"'") for t in tags_str.split(",")]
+        # Filter tags to only include those in user's interests (case-insensitive match)
+        interests_lower = {i.lower(): i for i in preferences.interests} if preferences.interests else {}
+        # Use original capitalization from interests list
+        return [interests_lower[t.lower()] for t in raw_tags if t.lower() in interests_lower][:3], False
+    
+    @staticmethod
+    def _clean_summary(summary: str) -> str:
+        """Strip preambles and cap the summary at 4 sentences."""
+        # Post-process: remove common preambles if LLM still adds them
+        summary = _PREAMBLE_RE.sub('', summary, count=1)
+        
+        # Final safety check: if LLM ignored the 4-sentence limit, we take the first 4.
+        # This prevents UI layout shifts.
+        sentences = _SENTENCE_RE.findall(summary)
+        if len(sentences) > 4:
+            summary = ''.join(sentences[:4])
+        
+        return summary.strip()
+    
+    @staticmethod
+    def _score(tags: list[str], quality: str, is_excluded: bool) -> int:
         """
         Hybrid scoring: AI extracts topic tags, code calculates score.
         
@@ -131,117 +405,41 @@ Summary:"""
         Scoring: 0 tags=1-3, 1 tag=4-6, 2 tags=6-8, 3+ tags=8-10.
         Quality assessment (low/medium/high) adjusts within range.
         """
-        try:
-            # Build context from user preferences
-            interests_str = ", ".join(preferences.interests) if preferences.interests else "general tech news"
-            exclude_str = ", ".join(preferences.exclude_topics) if preferences.exclude_topics else "none"
-            
-            # Simplified prompt - just ask for tags and basic quality assessment
-            prompt = f"""Analyze this article for a reader interested in: {interests_str}
-Topics to AVOID: {exclude_str}
-
-Your task:
-1. Identify which topics from the interest list this article is CLEARLY about (main focus, not just mentioned)
-2. Assess the article quality: low, medium, or high
-
-Available topics: {interests_str}
-
-Article:
-Title: {title}
-Content: {content[:800]}
-
-IMPORTANT:
-- Only tag topics that are a PRIMARY focus of the article
-- If article is about excluded topics, return EXCLUDED
-- Return 0-3 tags maximum
-- Most articles should have 0-1 tags
-
-Format:
-Tags: [tag1, tag2] OR Tags: [] OR Tags: EXCLUDED
-Quality: low OR Quality: medium OR Quality: high"""
-            
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": f"You are a topic tagger. Extract relevant topics from articles. Only use these exact topics: {interests_str}. Be selective - most articles should get 0-1 tags."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-                max_tokens=100
-            )
-            
-            result = response.choices[0].message.content.strip()
-            
-            # Parse tags
-            tags = []
-            quality = "medium"  # Default
-            is_excluded = False
-            
-            for line in result.split("\n"):
-                line = line.strip()
-                if line.startswith("Tags:"):
-                    tags_str = line.split(":", 1)[1].strip()
-                    if tags_str.upper() == "EXCLUDED":
-                        is_excluded = True
-                        tags = []
-                    elif tags_str.lower() in ["none", "n/a", "na", "[]", ""]:
-                        tags = []
-                    else:
-                        raw_tags = [t.strip().strip("[]\"'") for t in tags_str.split(",")]
-                        # Filter tags to only include those in user's interests (case-insensitive match)
-                        interests_lower = {i.lower(): i for i in preferences.interests} if preferences.interests else {}
-                        # Use original capitalization from interests list
-                        tags = [interests_lower[t.lower()] for t in raw_tags if t.lower() in interests_lower][:3]
-                elif line.startswith("Quality:"):
-                    quality_str = line.split(":")[1].strip().lower()
-                    if quality_str in ["low", "medium", "high"]:
-                        quality = quality_str
-            
-            # PROGRAMMATIC SCORING based on tags
-            if is_excluded:
-                # Article is about excluded topic
-                score = 0
-            elif len(tags) == 0:
-                # No matching interests - low relevance
-                if quality == "high":
-                    score = 3  # Maybe tangentially interesting
-                elif quality == "medium":
-                    score = 2
-                else:
-                    score = 1
-            elif len(tags) == 1:
-                # One matching interest - moderate relevance
-                if quality == "high":
-                    score = 6  # Good coverage of one interest
-                elif quality == "medium":
-                    score = 5  # Standard coverage
-                else:
-                    score = 4  # Superficial coverage
-            elif len(tags) == 2:
-                # Two matching interests - high relevance
-                if quality == "high":
-                    score = 8  # Excellent multi-topic article
-                elif quality == "medium":
-                    score = 7  # Good multi-topic coverage
-                else:
-                    score = 6  # Multiple topics but shallow
-            else:  # 3+ tags
-                # Three+ matching interests - exceptional relevance
-                if quality == "high":
-                    score = 10  # Perfect match
-                elif quality == "medium":
-                    score = 9  # Excellent coverage
-                else:
-                    score = 8  # Good but not deep
-            
-            return score, tags
-            
-        except (APIConnectionError, APITimeoutError) as e:
-            logger.warning(f"AI service unavailable for scoring: {e}")
-            return 5, []  # Default: medium relevance when AI unavailable
-        except Exception as e:
-            logger.error(f"Unexpected error scoring article: {type(e).__name__}: {e}")
-            return 5, []  # Default: medium relevance, no tags
+        if is_excluded:
+            # Article is about excluded topic
+            return 0
+        elif len(tags) == 0:
+            # No matching interests - low relevance
+            if quality == "high":
+                return 3  # Maybe tangentially interesting
+            elif quality == "medium":
+                return 2
+            else:
+                return 1
+        elif len(tags) == 1:
+            # One matching interest - moderate relevance
+            if quality == "high":
+                return 6  # Good coverage of one interest
+            elif quality == "medium":
+                return 5  # Standard coverage
+            else:
+                return 4  # Superficial coverage
+        elif len(tags) == 2:
+            # Two matching interests - high relevance
+            if quality == "high":
+                return 8  # Excellent multi-topic article
+            elif quality == "medium":
+                return 7  # Good multi-topic coverage
+            else:
+                return 6  # Multiple topics but shallow
+        else:  # 3+ tags
+            # Three+ matching interests - exceptional relevance
+            if quality == "high":
+                return 10  # Perfect match
+            elif quality == "medium":
+                return 9  # Excellent coverage
+            else:
+                return 8  # Good but not deep
     
     async def process_article(
         self,
@@ -249,18 +447,8 @@ Quality: low OR Quality: medium OR Quality: high"""
         content: str,
         preferences: UserPreferences
     ) -> dict:
-        """Run summary and scoring in parallel, return dict with both results."""
-        # Run both operations in parallel for better performance
-        summary, (score, tags) = await asyncio.gather(
-            self.summarize_article(title, content),
-            self.score_relevance(title, content, preferences)
-        )
-        
-        return {
-            "summary": summary,
-            "relevance_score": score,
-            "tags": tags
-        }
+        """Return dict with summary, relevance_score and tags for an article."""
+        return await self.analyze_article(title, content, preferences)
 
 
 # Global AI processor instance
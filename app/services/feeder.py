@@ -1,21 +1,31 @@
+import asyncio
 import feedparser
 import ipaddress
 import logging
+import re
+import time
 import httpx
 import trafilatura
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html import escape
+from io import BytesIO
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-from pymongo.errors import DuplicateKeyError
+import lxml.html
+from lxml import etree
+from pymongo.errors import BulkWriteError
+from app.config import settings
 from app.database import get_database
 from app.models import UserPreferences
-from app.services.ai_processor import ai_processor
+from app.services.ai_processor import ASCII_CHARS_PER_TOKEN, ai_processor
 from dateutil import parser as date_parser
 
 logger = logging.getLogger(__name__)
 
 # Constants
 FEED_FETCH_TIMEOUT = 30  # seconds
+ARTICLE_WRITE_BATCH_SIZE = 500  # articles per insert_many
 
 # Tags and attributes allowed in sanitized article HTML
 _ALLOWED_TAGS = {
@@ -27,10 +37,98 @@ _ALLOWED_ATTRS: dict[str, list[str]] = {'a': ['href']}
 # Tags whose content should be dropped entirely (never just unwrapped)
 _DANGEROUS_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'form', 'input', 'meta', 'link'}
 
+# lxml refuses str input that carries an encoding declaration, so it is stripped first
+_XML_DECLARATION_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+# libxml2's HTML parser drops inline CDATA sections; BeautifulSoup keeps their text as
+# a separate string, so each one becomes its own escaped <span>
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+
+
+# Link types feedparser accepts as an entry's page link
+_HTML_LINK_TYPES = {"text/html", "application/xhtml+xml"}
+
+# Entry elements for RSS 2.0, RSS 1.0 (RDF) and Atom feeds
+_ATOM_NS = "http://www.w3.org/2005/Atom"
+_ENTRY_TAGS = ("item", "{http://purl.org/rss/1.0/}item", f"{{{_ATOM_NS}}}entry")
+
+# Child element local name -> entry key, using feedparser's key names so
+# both parsers feed the same extraction code
+_ENTRY_FIELDS = {
+    "title": "title",
+    "description": "summary",
+    "summary": "summary",
+    "encoded": "description",  # content:encoded
+    "content": "description",  # Atom content
+    "pubDate": "published",
+    "published": "published",
+    "date": "published",  # dc:date
+    "updated": "updated",
+}
+
+
+def _iter_entries(xml_bytes: bytes):
+    """
+    Stream entries out of an RSS/Atom document with lxml.etree.iterparse.
+    
+    Yields dicts with title/link/summary/description/published/updated keys.
+    Finished elements are cleared so memory stays flat on large feeds.
+    Raises etree.XMLSyntaxError for documents that aren't well-formed XML.
+    """
+    context = etree.iterparse(
+        BytesIO(xml_bytes), events=("end",), tag=_ENTRY_TAGS,
+        resolve_entities=False, no_network=True
+    )
+    for _, elem in context:
+        entry: dict[str, str] = {}
+        guid_link = ""
+        for child in elem:
+            if not isinstance(child.tag, str):
+                continue  # Comments and processing instructions
+            name = etree.QName(child).localname
+            
+            if name == "link":
+                # Like feedparser, the last <link> text or HTML rel="alternate" href
+                # wins; Atom links carry the URL in href
+                href = child.get("href")
+                if href is None:
+                    entry["link"] = (child.text or "").strip()
+                elif (
+                    child.get("rel", "alternate") == "alternate"
+                    and child.get("type", "text/html").lower() in _HTML_LINK_TYPES
+                ):
+                    entry["link"] = href.strip()
+                continue
+            
+            if name == "guid":
+                # RSS 2.0 guids are permalinks unless marked otherwise; like feedparser,
+                # use one as the link when the item has no <link>
+                if child.get("isPermaLink", "true").lower() != "false":
+                    guid_link = (child.text or "").strip()
+                continue
+            
+            key = _ENTRY_FIELDS.get(name)
+            if key and key not in entry:
+                # XHTML content is nested markup rather than escaped text
+                text = child.text if len(child) == 0 else "".join(child.itertext())
+                entry[key] = (text or "").strip()
+        
+        if "link" not in entry and guid_link:
+            entry["link"] = guid_link
+        
+        yield entry
+        
+        # Free the processed entry and any preceding siblings
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
 
 class RSSFeeder:
     def __init__(self):
         self.db = None
+        # (monotonic time fetched, preferences) reused across feed fetches
+        self._prefs_cache: tuple[float, UserPreferences] | None = None
+        self._prefs_ttl = 60  # seconds
     
     def _ensure_db(self):
         if self.db is None:
@@ -86,26 +184,60 @@ class RSSFeeder:
 
     @staticmethod
     def _clean_html(html_content: str) -> str:
+        """Extract plain text from entry HTML (lxml's C parser; same output as BeautifulSoup's get_text)."""
         if not html_content:
             return ""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        return soup.get_text(separator=' ', strip=True)
+        html_content = _XML_DECLARATION_RE.sub("", html_content, count=1)
+        if "<![CDATA[" in html_content:
+            html_content = _CDATA_RE.sub(lambda m: f"<span>{escape(m.group(1))}</span>", html_content)
+        try:
+            doc = lxml.html.fromstring(html_content)
+        except (etree.ParserError, ValueError):
+            return ""  # Whitespace-only or otherwise empty document
+        # Like get_text: script, style and template content is skipped. The elements (and
+        # comments, which itertext skips) stay in place so the text around them isn't merged
+        for element in list(doc.iter('script', 'style', 'template')):
+            element.text = None
+            del element[:]
+        return ' '.join(text.strip() for text in doc.itertext() if text.strip())
     
     @staticmethod
     def _parse_date(date_str: str) -> datetime | None:
         if not date_str:
             return None
+        # Fast paths for the formats feeds actually use: ISO-8601 (Atom) and RFC-822 (RSS)
         try:
-            return date_parser.parse(date_str)
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(date_str)
         except (ValueError, TypeError):
+            pass
+        # Generic (slow) fallback for anything else
+        try:
+            return date_parser.parse(date_str)
+        except (ValueError, TypeError, OverflowError):
             return None
     
-    async def _fetch_feed_content(self, feed_url: str) -> str | None:
+    @classmethod
+    def _entry_date(cls, entry) -> datetime | None:
+        """Published (or updated) date of a feed entry."""
+        # feedparser already parsed recognised dates into a UTC struct_time
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed:
+            return datetime(*parsed[:6], tzinfo=timezone.utc)
+        
+        published_str = entry.get('published', '') or entry.get('updated', '')
+        return cls._parse_date(published_str)
+    
+    async def _fetch_feed_content(self, feed_url: str) -> bytes | None:
         try:
             async with httpx.AsyncClient(timeout=FEED_FETCH_TIMEOUT) as client:
                 response = await client.get(feed_url, follow_redirects=True)
                 response.raise_for_status()
-                return response.text
+                # Raw bytes: XML parsers honour the document's own encoding declaration
+                return response.content
         except httpx.TimeoutException:
             logger.warning(f"Timeout fetching feed: {feed_url}")
             return None
@@ -145,9 +277,9 @@ class RSSFeeder:
         
         **Deduplication Strategy**: Articles are uniquely identified by their URL.
         Three layers prevent re-processing and re-summarizing:
-        1. Application check: Query database before AI processing
+        1. Application check: Bulk query database before AI processing
         2. Database constraint: Unique index on 'url' field (database.py)
-        3. Race condition handler: Catch DuplicateKeyError
+        3. Race condition handler: Treat duplicate-key errors from insert_many as benign
         
         Args:
             feed_url: The RSS feed URL
@@ -166,85 +298,54 @@ class RSSFeeder:
             if feed_content is None:
                 return 0
             
-            # Parse RSS feed
-            feed = feedparser.parse(feed_content)
-            
-            if feed.bozo:
-                logger.warning(f"Feed parse warning for {feed_name}: {feed.bozo_exception}")
+            # Parse RSS feed (CPU-bound; keep it off the event loop)
+            entries = await asyncio.to_thread(self._parse_feed, feed_content, feed_name)
             
             # Get user preferences for AI processing
             preferences = await self._get_user_preferences()
             
-            new_articles_count = 0
+            # One timestamp for the whole pass instead of one per entry
+            fetched_at = datetime.now(timezone.utc)
             
-            for entry in feed.entries:
-                try:
-                    # Extract article data
-                    url = entry.get('link', '')
-                    title = entry.get('title', 'No Title')
-                    
-                    # Check if article already exists (prevents re-processing and re-summarizing)
-                    # This is the first layer of deduplication - query before processing
-                    existing = await self.db.articles.find_one({"url": url})
-                    if existing:
-                        logger.debug(f"Skipping existing article: {title} ({url})")
-                        continue
-                    
-                    # Get content/description
-                    content = entry.get('summary', '') or entry.get('description', '')
-                    content = self._clean_html(content)
-                    
-                    # Parse published date
-                    published_str = entry.get('published', '') or entry.get('updated', '')
-                    published_at = self._parse_date(published_str) or datetime.now(timezone.utc)
-                    
-                    # Process with AI
-                    ai_result = await ai_processor.process_article(
-                        title=title,
-                        content=content,
-                        preferences=preferences
-                    )
-                    
-                    # Determine if article should be hidden based on relevance score threshold
-                    min_score = preferences.min_relevance_score
-                    is_hidden = ai_result["relevance_score"] < min_score if ai_result["relevance_score"] is not None else False
-                    
-                    # Create article document
-                    article_doc = {
-                        "url": url,
-                        "title": title,
-                        "source": feed_name,
-                        "published_at": published_at,
-                        "summary": ai_result["summary"],
-                        "relevance_score": ai_result["relevance_score"],
-                        "tags": ai_result["tags"],
-                        "is_read": False,
-                        "is_hidden": is_hidden,
-                        "created_at": datetime.now(timezone.utc)
-                    }
-                    
-                    # Insert into database (handle race condition)
-                    # This is the third layer of deduplication - catch concurrent inserts
-                    try:
-                        await self.db.articles.insert_one(article_doc)
-                        new_articles_count += 1
-                        logger.info(f"Added article: {title} (score: {ai_result['relevance_score']})")
-                    except DuplicateKeyError:
-                        # Article was inserted by another process between our check and insert
-                        # This can happen if multiple feed fetches run concurrently
-                        logger.debug(f"Article already inserted by concurrent process: {title}")
-                        continue
-                    
-                except Exception as e:
-                    logger.error(f"Error processing entry from {feed_name}: {e}")
-                    continue
+            # Pre-pass: extract article data from every entry (CPU-bound HTML cleaning,
+            # so run it in a worker thread as well)
+            candidates = await asyncio.to_thread(
+                self._extract_entries, entries, feed_name, fetched_at
+            )
+            
+            # Check which articles already exist (prevents re-processing and re-summarizing)
+            # This is the first layer of deduplication - one bulk query before processing
+            existing = {
+                doc["url"]
+                async for doc in self.db.articles.find(
+                    {"url": {"$in": list(candidates)}}, {"url": 1, "_id": 0}
+                )
+            }
+            for url in existing:
+                logger.debug(f"Skipping existing article: {candidates[url]['title']} ({url})")
+            
+            # Process new articles with AI concurrently (AIProcessor bounds the Ollama calls)
+            results = await asyncio.gather(*(
+                self._process_entry(candidate, feed_name, preferences)
+                for url, candidate in candidates.items()
+                if url not in existing
+            ))
+            article_docs = [doc for doc in results if doc is not None]
+            
+            # Insert into database (handle race condition)
+            # This is the third layer of deduplication - duplicate-key errors are benign
+            new_articles_count = 0
+            for i in range(0, len(article_docs), ARTICLE_WRITE_BATCH_SIZE):
+                new_articles_count += await self._write_articles(
+                    article_docs[i:i + ARTICLE_WRITE_BATCH_SIZE]
+                )
             
             # Update feed's last_fetched_at and reset error count
             await self.db.feeds.update_one(
                 {"url": feed_url},
                 {
                     "$set": {
-                        "last_fetched_at": datetime.now(timezone.utc),
+                        "last_fetched_at": fetched_at,
                         "error_count": 0
                     }
                 }
@@ -264,24 +365,153 @@ class RSSFeeder:
             
             return 0
     
+    @staticmethod
+    def _parse_feed(feed_content: bytes, feed_name: str) -> list:
+        """Parse feed entries, preferring the streaming lxml path over feedparser."""
+        try:
+            entries = list(_iter_entries(feed_content))
+            if entries:
+                return entries
+        except etree.XMLSyntaxError:
+            pass  # Malformed XML: feedparser's lenient parser copes better
+        
+        feed = feedparser.parse(feed_content)
+        
+        if feed.bozo:
+            logger.warning(f"Feed parse warning for {feed_name}: {feed.bozo_exception}")
+        
+        return feed.entries
+    
+    def _extract_entries(self, entries: list, feed_name: str, fetched_at: datetime) -> dict[str, dict]:
+        """Extract article data from parsed entries, keyed (and deduplicated) by URL."""
+        candidates: dict[str, dict] = {}
+        for entry in entries:
+            try:
+                candidate = self._extract_entry(entry, fetched_at)
+                if not candidate["url"]:
+                    # Without a URL there is nothing to link to or deduplicate on
+                    logger.debug(f"Skipping entry without a link from {feed_name}: {candidate['title']}")
+                    continue
+                # Feeds occasionally repeat a link; keep the first occurrence
+                candidates.setdefault(candidate["url"], candidate)
+            except Exception as e:
+                logger.error(f"Error processing entry from {feed_name}: {e}")
+        return candidates
+    
+    def _extract_entry(self, entry, fetched_at: datetime) -> dict:
+        """Pull the fields needed for an article out of a parsed feed entry."""
+        # Get content/description
+        content = entry.get('summary', '') or entry.get('description', '')
+        
+        return {
+            "url": entry.get('link', ''),
+            "title": entry.get('title', 'No Title'),
+            # The AI prompt never reads past its token budget, even for pure ASCII text
+            "content": self._clean_html(content)[:settings.ai_content_tokens * ASCII_CHARS_PER_TOKEN],
+            "published_at": self._entry_date(entry) or fetched_at,
+            "created_at": fetched_at
+        }
+    
+    async def _process_entry(
+        self,
+        candidate: dict,
+        feed_name: str,
+        preferences: UserPreferences
+    ) -> dict | None:
+        """Run AI processing for one new entry and build its article document."""
+        try:
+            ai_result = await ai_processor.process_article(
+                title=candidate["title"],
+                content=candidate["content"],
+                preferences=preferences
+            )
+        except Exception as e:
+            logger.error(f"Error processing entry from {feed_name}: {e}")
+            return None
+        
+        # Determine if article should be hidden based on relevance score threshold
+        min_score = preferences.min_relevance_score
+        is_hidden = ai_result["relevance_score"] < min_score if ai_result["relevance_score"] is not None else False
+        
+        return {
+            "url": candidate["url"],
+            "title": candidate["title"],
+            "source": feed_name,
+            "published_at": candidate["published_at"],
+            "summary": ai_result["summary"],
+            "relevance_score": ai_result["relevance_score"],
+            "tags": ai_result["tags"],
+            "is_read": False,
+            "is_hidden": is_hidden,
+            "created_at": candidate["created_at"]
+        }
+    
+    async def _write_articles(self, articles: list[dict]) -> int:
+        """Insert articles in one unordered batch. Returns how many were actually new."""
+        if not articles:
+            return 0
+        
+        failed: set[int] = set()
+        try:
+            await self.db.articles.insert_many(articles, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            failed = {err["index"] for err in errors}
+            # Duplicate key: the article was inserted by another process between our
+            # check and insert (e.g. concurrent feed fetches), so it's benign
+            unexpected = [err for err in errors if err.get("code") != 11000]
+            if unexpected:
+                # Anything else is a real write failure; fetch_feed records it on the feed
+                logger.error(f"Failed to insert {len(unexpected)} articles: {unexpected[0].get('errmsg')}")
+                raise
+            logger.debug(f"{len(errors)} articles already inserted by concurrent process")
+        
+        for index, article in enumerate(articles):
+            if index not in failed:
+                logger.info(f"Added article: {article['title']} (score: {article['relevance_score']})")
+        
+        return len(articles) - len(failed)
+    
     async def fetch_all_enabled_feeds(self) -> int:
         """Fetch all enabled feeds and return total new article count."""
         self._ensure_db()
         
         try:
-            # Get all enabled feeds
-            cursor = self.db.feeds.find({"enabled": True})
-            feeds = await cursor.to_list(length=100)
+            # Feeds are independent, so fetch them concurrently; AI calls stay
+            # bounded by AIProcessor's semaphore so Ollama isn't overloaded
+            semaphore = asyncio.Semaphore(settings.feed_concurrency)
+            
+            async def bounded_fetch(feed: dict) -> int:
+                async with semaphore:
+                    try:
+                        return await self.fetch_feed(feed["url"], feed["name"])
+                    except Exception as e:
+                        logger.error(f"Error fetching feed {feed['name']}: {e}")
+                        return 0
             
-            if not feeds:
+            # Start each fetch as soon as its feed comes off the cursor (no 100-feed cap)
+            tasks: list[asyncio.Task] = []
+            try:
+                async for feed in self.db.feeds.find({"enabled": True}, {"url": 1, "name": 1}):
+                    tasks.append(asyncio.create_task(bounded_fetch(feed)))
+            except BaseException:
+                # Don't leave already started fetches running with nobody awaiting them
+                await self._cancel_tasks(tasks)
+                raise
+            
+            if not tasks:
                 logger.warning("No enabled feeds found")
                 return 0
             
+            # Accumulate progressively so partial progress is logged if the pass is cancelled
             total_new_articles = 0
-            
-            for feed in feeds:
-                count = await self.fetch_feed(feed["url"], feed["name"])
-                total_new_articles += count
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    total_new_articles += await next_done
+            except asyncio.CancelledError:
+                logger.warning(f"Feed fetch cancelled after {total_new_articles} new articles")
+                await self._cancel_tasks(tasks)
+                raise
             
             logger.info(f"Total new articles fetched: {total_new_articles}")
             return total_new_articles
@@ -290,21 +520,41 @@ class RSSFeeder:
             logger.error(f"Error fetching all feeds: {e}")
             return 0
     
+    @staticmethod
+    async def _cancel_tasks(tasks: list[asyncio.Task]) -> None:
+        """Cancel tasks and wait for them to finish so no result or exception goes unretrieved."""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def invalidate_prefs(self) -> None:
+        """Drop cached preferences; call after the preferences document changes."""
+        self._prefs_cache = None
+    
     async def _get_user_preferences(self) -> UserPreferences:
         self._ensure_db()
         
+        # Preferences rarely change; reuse them across feeds within the TTL
+        if self._prefs_cache is not None:
+            fetched_at, preferences = self._prefs_cache
+            if time.monotonic() - fetched_at < self._prefs_ttl:
+                return preferences
+        
         prefs_doc = await self.db.preferences.find_one()
         
         if prefs_doc:
-            return UserPreferences(**prefs_doc)
+            preferences = UserPreferences(**prefs_doc)
         else:
             # Return default preferences
-            return UserPreferences(
+            preferences = UserPreferences(
                 interests=["Python", "DevOps", "AI", "Web Development"],
                 exclude_topics=["Cryptocurrency", "Blockchain"],
                 min_relevance_score=5,
                 dark_mode=False
             )
+        
+        self._prefs_cache = (time.monotonic(), preferences)
+        return preferences
 
 
 # Global feeder instance
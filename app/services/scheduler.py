@@ -1,8 +1,10 @@
+import asyncio
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timedelta, timezone
 from app.config import settings
+from app.services.ai_processor import ai_processor
 from app.services.feeder import rss_feeder
 from app.database import get_database
 
@@ -11,11 +13,25 @@ logger = logging.getLogger(__name__)
 # Global scheduler instance
 scheduler = AsyncIOScheduler()
 
+CLEANUP_BATCH_SIZE = 1000  # articles per delete_many in the cleanup job
+
+# Reference to the one-shot model warmup so it isn't garbage collected mid-run
+_warmup_task: asyncio.Task | None = None
+
+
+# Held for the duration of a scheduled fetch pass so passes never overlap
+_fetch_lock = asyncio.Lock()
+
 
 async def scheduled_feed_fetch():
+    if _fetch_lock.locked():
+        logger.warning("Previous scheduled fetch still running; skipping this run")
+        return
+    
     logger.info("Starting scheduled RSS feed fetch")
     try:
-        new_count = await rss_feeder.fetch_all_enabled_feeds()
+        async with _fetch_lock:
+            new_count = await rss_feeder.fetch_all_enabled_feeds()
         logger.info(f"Scheduled fetch completed. {new_count} new articles added.")
     except Exception as e:
         logger.error(f"Error in scheduled feed fetch: {e}")
@@ -33,11 +49,23 @@ async def cleanup_old_articles():
         
         # Delete articles older than prune_after_days that are NOT starred
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=prune_after_days)
-        result = await db.articles.delete_many({
+        old_articles = {
             "is_starred": {"$ne": True},  # Not starred
             "created_at": {"$lt": cutoff_date}  # Older than cutoff
-        })
-        deleted_count = result.deleted_count
+        }
+        
+        # Delete in batches (ids come from the is_starred/created_at index) so a large
+        # backlog never turns into one long-running delete
+        deleted_count = 0
+        while True:
+            batch = await db.articles.find(old_articles, {"_id": 1}).limit(
+                CLEANUP_BATCH_SIZE
+            ).to_list(length=CLEANUP_BATCH_SIZE)
+            if not batch:
+                break
+            result = await db.articles.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+            deleted_count += result.deleted_count
+        
         if deleted_count > 0:
             logger.info(f"Deleted {deleted_count} old articles (older than {prune_after_days} days, kept starred articles)")
         else:
@@ -47,6 +75,7 @@ async def cleanup_old_articles():
 
 
 def start_scheduler():
+    global _warmup_task
     try:
         # Schedule RSS fetch job
         scheduler.add_job(
@@ -54,6 +83,8 @@ def start_scheduler():
             trigger=IntervalTrigger(hours=settings.rss_fetch_interval_hours),
             id="rss_fetch_job",
             name="Fetch RSS feeds",
+            max_instances=1,
+            coalesce=True,  # Missed runs collapse into one instead of firing back to back
             replace_existing=True
         )
         
@@ -70,6 +101,10 @@ def start_scheduler():
         logger.info(f"Scheduler started. RSS feeds will be fetched every {settings.rss_fetch_interval_hours} hour(s)")
         logger.info("Cleanup job scheduled to run every 24 hours (keeps starred articles)")
         
+        # Load the model now (availability was checked at startup) so the first
+        # scheduled fetch doesn't pay Ollama's cold-start latency
+        _warmup_task = asyncio.create_task(ai_processor.warmup())
+        
     except Exception as e:
         logger.error(f"Failed to start scheduler: {e}")
 
@@ -0,0 +1,121 @@
+"""Shared pytest fixtures."""
+import pytest
+import pytest_asyncio
+from types import SimpleNamespace
+from httpx import AsyncClient, ASGITransport
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from unittest.mock import AsyncMock, MagicMock
+
+# Awaited collection methods the API calls, pre-created as AsyncMocks on the shared mock.
+# The hot find_one reads are left as plain mocks; tests give them pre-resolved futures.
+ASYNC_COLLECTION_METHODS = {
+    "articles": ["update_one", "find_one", "find_one_and_update"],
+    "feeds": ["insert_one", "delete_one"],
+    "preferences": ["update_one"],
+}
+
+
+def build_mock_db() -> MagicMock:
+    """Build a database mock whose collections only allow real Motor attributes."""
+    db = MagicMock(spec=AsyncIOMotorDatabase)
+    for name, methods in ASYNC_COLLECTION_METHODS.items():
+        collection = MagicMock(spec=AsyncIOMotorCollection)
+        for method in methods:
+            setattr(collection, method, AsyncMock())
+        setattr(db, name, collection)
+    return db
+
+
+class FakeCollection:
+    """In-memory collection for the find/sort/limit/to_list and delete_many calls of batched deletes."""
+    
+    OPERATORS = {
+        "$lt": lambda value, arg: value is not None and value < arg,
+        "$lte": lambda value, arg: value is not None and value <= arg,
+        "$ne": lambda value, arg: value != arg,
+        "$in": lambda value, arg: value in arg,
+    }
+    
+    def __init__(self, docs: list[dict]):
+        self.docs = list(docs)
+        self.delete_calls = 0
+        self._query: list[dict] = []
+    
+    def _matches(self, doc: dict, query: dict) -> bool:
+        for field, condition in query.items():
+            if isinstance(condition, dict):
+                if not all(self.OPERATORS[op](doc.get(field), arg) for op, arg in condition.items()):
+                    return False
+            elif doc.get(field) != condition:
+                return False
+        return True
+    
+    def find(self, query: dict, projection: dict | None = None):
+        self._query = [doc for doc in self.docs if self._matches(doc, query)]
+        return self
+    
+    def sort(self, field: str, direction: int):
+        self._query.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+    
+    def limit(self, count: int):
+        self._query = self._query[:count]
+        return self
+    
+    async def to_list(self, length: int) -> list[dict]:
+        return [{"_id": doc["_id"]} for doc in self._query[:length]]
+    
+    async def delete_many(self, query: dict):
+        self.delete_calls += 1
+        kept = [doc for doc in self.docs if not self._matches(doc, query)]
+        deleted, self.docs = len(self.docs) - len(kept), kept
+        return SimpleNamespace(deleted_count=deleted)
+
+
+@pytest.fixture
+def fake_collection():
+    """Factory for in-memory collections: fake_collection(docs)."""
+    return FakeCollection
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _shared_db():
+    """Serve one shared mock database to every endpoint through FastAPI's dependency overrides."""
+    from app.database import get_database
+    from app.main import app
+    
+    shared_db = build_mock_db()
+    app.dependency_overrides[get_database] = lambda: shared_db
+    yield shared_db
+    app.dependency_overrides.pop(get_database, None)
+
+
+@pytest.fixture
+def mock_db(_shared_db):
+    """The shared mock database; tests set return values and it is reset afterwards."""
+    yield _shared_db
+    _shared_db.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """One HTTP client for the whole session; DB access is still mocked per test."""
+    from app.main import app
+    
+    # ASGITransport never runs the app lifespan, so no Mongo/Ollama startup happens here.
+    # Calls are in-process, so a timeout would only add a watchdog per request.
+    transport = ASGITransport(app=app, raise_app_exceptions=True)
+    async with AsyncClient(transport=transport, base_url="http://test", timeout=None) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def reset_app_caches():
+    """Clear the app's in-process caches so one test's mocked data can't leak into the next."""
+    from app.main import invalidate_prefs_cache, invalidate_total_count_cache
+    
+    invalidate_prefs_cache()
+    invalidate_total_count_cache()
+    yield
+    invalidate_prefs_cache()
+    invalidate_total_count_cache()
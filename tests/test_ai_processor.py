@@ -0,0 +1,232 @@
+"""Tests for AI response streaming and parsing."""
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from app.models import UserPreferences
+from app.config import settings
+from app.services.ai_processor import SUMMARY_OFFLINE, AIProcessor, truncate_to_tokens
+
+PREFERENCES = UserPreferences(interests=["Python", "AI"], exclude_topics=["Crypto"])
+
+SUMMARY = "One fact. Two facts. Three facts. Four facts."
+
+
+class FakeStream:
+    """Async iterator of OpenAI-style chunks that records how far it was consumed."""
+    
+    def __init__(self, pieces: list[str]):
+        self.pieces = pieces
+        self.consumed = 0
+        self.closed = False
+    
+    def __aiter__(self):
+        return self._chunks()
+    
+    async def _chunks(self):
+        for piece in self.pieces:
+            self.consumed += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+    
+    async def close(self):
+        self.closed = True
+
+
+def stream_of(text: str) -> FakeStream:
+    """Split text into word-sized chunks, the way tokens arrive."""
+    return FakeStream([word + " " for word in text.split(" ")])
+
+
+class TestReadUntilSummaryComplete:
+    async def test_stops_after_fourth_summary_sentence(self):
+        """Test that the stream is closed once the trailing summary is complete."""
+        stream = stream_of(f"Tags: [Python]\nQuality: high\nSummary: {SUMMARY} Five facts. Six facts.")
+        text = await AIProcessor._read_until_summary_complete(stream)
+        
+        assert stream.closed
+        assert stream.consumed < len(stream.pieces)
+        assert "Five" not in text
+    
+    async def test_stops_after_decorated_summary(self):
+        """Test that markdown-decorated labels still let the stream stop early."""
+        stream = stream_of(
+            f"**Tags:** [Python]\n**Quality:** high\n**Summary:** {SUMMARY} Five facts. Six facts."
+        )
+        text = await AIProcessor._read_until_summary_complete(stream)
+        
+        assert stream.closed
+        assert "Five" not in text
+    
+    async def test_waits_for_tags_and_quality_when_summary_comes_first(self):
+        """Test that a summary-first response is read until Tags and Quality arrive."""
+        stream = stream_of(f"Summary: {SUMMARY}\nTags: [Python]\nQuality: high\n")
+        text = await AIProcessor._read_until_summary_complete(stream)
+        
+        assert stream.closed
+        assert "Tags: [Python]" in text
+        assert "Quality: high" in text
+
+
+class TestParseResponse:
+    @pytest.mark.parametrize("response", [
+        f"Tags: [Python]\nQuality: high\nSummary: {SUMMARY}",
+        f"Summary: {SUMMARY}\nTags: [Python]\nQuality: high",
+        f"Quality: high\nSummary: {SUMMARY}\nTags: [Python]",
+    ], ids=["summary-last", "summary-first", "summary-middle"])
+    def test_section_order(self, response):
+        """Test that sections are parsed regardless of the order the model wrote them in."""
+        analysis, is_complete = AIProcessor._parse_response(response, PREFERENCES)
+        assert analysis == {"summary": SUMMARY, "relevance_score": 6, "tags": ["Python"]}
+        assert is_complete
+    
+    @pytest.mark.parametrize("response", [
+        f"**Tags:** [Python]\n**Quality:** high\n**Summary:** {SUMMARY}",
+        f"**Tags**: [Python]\n**Quality**: high\n\n**Summary**: {SUMMARY}",
+        f"## Tags: [Python]\n## Quality: high\n## Summary:\n{SUMMARY}",
+        f"TAGS: [Python]\nquality: high\nsummary: {SUMMARY}",
+    ], ids=["bold-label", "bold-name", "heading", "case"])
+    def test_decorated_labels(self, response):
+        """Test that markdown-decorated or differently cased labels are still recognized."""
+        analysis, is_complete = AIProcessor._parse_response(response, PREFERENCES)
+        assert analysis == {"summary": SUMMARY, "relevance_score": 6, "tags": ["Python"]}
+        assert is_complete
+    
+    @pytest.mark.parametrize("response,score,tags,complete", [
+        (SUMMARY, 2, [], False),
+        (f"Here is a summary of the article: {SUMMARY}", 2, [], False),
+        (f"Tags: [Python]\nQuality: high\n{SUMMARY}", 6, ["Python"], True),
+        (f"{SUMMARY}\nTags: [Python]\nQuality: high", 6, ["Python"], True),
+    ], ids=["unlabeled", "unlabeled-preamble", "summary-label-missing", "summary-label-missing-first"])
+    def test_unlabeled_summary(self, response, score, tags, complete):
+        """Test that without a Summary label the remaining text becomes the summary."""
+        analysis, is_complete = AIProcessor._parse_response(response, PREFERENCES)
+        assert analysis == {"summary": SUMMARY, "relevance_score": score, "tags": tags}
+        assert is_complete is complete
+    
+    @pytest.mark.parametrize("response,score,tags,complete", [
+        (f"Tags: EXCLUDED\nQuality: high\nSummary: {SUMMARY}", 0, [], True),
+        (f"Tags: [Python, AI, Rust]\nQuality: low\nSummary: {SUMMARY}", 6, ["Python", "AI"], True),
+        (f"Tags: none\nQuality: medium\nSummary: {SUMMARY}", 2, [], True),
+        (f"Tags: [python]\nQuality: High.\nSummary: {SUMMARY}", 6, ["Python"], True),
+        (f"Tags: [Python]\nQuality: **low**\nSummary: {SUMMARY}", 4, ["Python"], True),
+        (f"Tags: [Python]\nQuality: excellent\nSummary: {SUMMARY}", 5, ["Python"], False),
+        (f"Tags: [Python]\nSummary: {SUMMARY}", 5, ["Python"], False),
+        ("Tags: [Python]\nQuality: high\nSummary:", 6, ["Python"], False),
+    ], ids=[
+        "excluded", "unknown-tag-dropped", "no-tags", "quality-trailing-punctuation",
+        "quality-markdown", "quality-unknown", "quality-missing", "summary-empty",
+    ])
+    def test_tags_and_quality(self, response, score, tags, complete):
+        """Test that tags and quality map to the expected score, and incomplete answers are flagged."""
+        analysis, is_complete = AIProcessor._parse_response(response, PREFERENCES)
+        assert (analysis["relevance_score"], analysis["tags"]) == (score, tags)
+        assert is_complete is complete
+    
+    async def test_summary_first_stream_keeps_tags(self):
+        """Test that a summary-first streamed response still yields its tags and quality."""
+        stream = stream_of(f"Summary: {SUMMARY}\nTags: [Python]\nQuality: high\n")
+        text = await AIProcessor._read_until_summary_complete(stream)
+        analysis, _ = AIProcessor._parse_response(text.strip(), PREFERENCES)
+        assert analysis["tags"] == ["Python"]
+        assert analysis["relevance_score"] == 6
+
+
+class TestCleanSummary:
+    @pytest.mark.parametrize("summary,expected", [
+        (SUMMARY, SUMMARY),
+        (f"{SUMMARY} Five facts. Six facts.", SUMMARY),
+        (f"Here is a summary of the article: {SUMMARY}", SUMMARY),
+        (f"Summary: {SUMMARY}", SUMMARY),
+        ("Python 3.5 shipped. It is fast! Is it? Yes. No.", "Python 3.5 shipped. It is fast! Is it? Yes."),
+        ("One. Two. Three. Four. Five without a stop", "One. Two. Three. Four."),
+        ("Only a fragment", "Only a fragment"),
+        ("", ""),
+    ], ids=[
+        "four-sentences", "capped-at-four", "preamble", "summary-label",
+        "decimals-not-split", "trailing-fragment", "fragment", "empty",
+    ])
+    def test_clean_summary(self, summary, expected):
+        """Test that preambles are stripped and summaries are capped at 4 sentences."""
+        assert AIProcessor._clean_summary(summary) == expected
+
+
+class TestTruncateToTokens:
+    @pytest.mark.parametrize("text,max_tokens,expected", [
+        ("a" * 100, 10, "a" * 40),
+        ("short", 10, "short"),
+        ("漢" * 100, 10, "漢" * 10),
+        ("ab漢cdef", 2, "ab漢cd"),
+        ("abcde漢", 2, "abcde"),
+        ("漢abcd", 2, "漢abcd"),
+        ("", 10, ""),
+    ], ids=["ascii-cut", "ascii-fits", "cjk-cut", "mixed-cut", "mixed-cut-at-cjk", "mixed-fits", "empty"])
+    def test_truncate_to_tokens(self, text, max_tokens, expected):
+        """Test that ASCII costs a quarter token per character and other characters a full token."""
+        assert truncate_to_tokens(text, max_tokens) == expected
+
+
+class TestAnalyzeArticleCache:
+    @pytest.mark.parametrize("response,cached", [
+        (f"Tags: [Python]\nQuality: high\nSummary: {SUMMARY}\n", True),
+        (f"**Tags:** []\n**Quality:** low\n{SUMMARY}\n", True),
+        (f"{SUMMARY}\n", False),
+        ("Tags: [Python]\nQuality: high\n", False),
+        (f"Tags: [Python]\nSummary: {SUMMARY}\n", False),
+    ], ids=["complete", "complete-unlabeled-summary", "no-tags-or-quality", "no-summary", "no-quality"])
+    async def test_only_complete_answers_are_cached(self, response, cached):
+        """Test that answers missing a section are returned but not cached."""
+        processor = AIProcessor()
+        store = AsyncMock()
+        
+        async def create(**kwargs):
+            return stream_of(response)
+        
+        with patch.object(processor, "_get_cached_result", AsyncMock(return_value=None)), \
+                patch.object(processor, "_store_cached_result", store), \
+                patch.object(processor.client.chat.completions, "create", create):
+            await processor.analyze_article("Title", "Body", PREFERENCES)
+        await processor.aclose()
+        
+        assert store.await_count == (1 if cached else 0)
+
+
+class TestAnalyzeArticleConcurrency:
+    async def test_model_calls_bounded_by_ai_concurrency(self):
+        """Test that concurrent analyses never exceed ai_concurrency in-flight model calls."""
+        processor = AIProcessor()
+        in_flight = peak = 0
+        
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return stream_of(f"Tags: []\nQuality: low\nSummary: {SUMMARY}\n")
+        
+        with patch.object(processor, "_get_cached_result", AsyncMock(return_value=None)), \
+                patch.object(processor, "_store_cached_result", AsyncMock()), \
+                patch.object(processor.client.chat.completions, "create", create):
+            await asyncio.gather(*(
+                processor.analyze_article(f"Title {i}", "Body", PREFERENCES)
+                for i in range(settings.ai_concurrency * 3)
+            ))
+        await processor.aclose()
+        
+        assert peak == settings.ai_concurrency
+    
+    async def test_stalled_call_releases_its_slot_at_the_deadline(self):
+        """Test that a model call outliving ai_article_timeout falls back and frees its slot."""
+        processor = AIProcessor()
+        
+        async def create(**kwargs):
+            await asyncio.sleep(10)
+        
+        with patch.object(processor, "_get_cached_result", AsyncMock(return_value=None)), \
+                patch.object(processor.client.chat.completions, "create", create), \
+                patch.object(settings, "ai_article_timeout", 0.01):
+            analysis = await processor.analyze_article("Title", "Body", PREFERENCES)
+        await processor.aclose()
+        
+        assert analysis["summary"] == SUMMARY_OFFLINE
+        assert processor._semaphore._value == settings.ai_concurrency
@@ -1,252 +1,156 @@
 """Tests for API endpoints."""
+import asyncio
 import pytest
-from httpx import AsyncClient, ASGITransport
-from unittest.mock import AsyncMock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import ANY
 from datetime import datetime
 from bson import ObjectId
+from app.main import FEED_DELETE_BATCH_SIZE, _delete_articles_by_source
 
+VALID_OID = ObjectId()
+VALID_OID_STR = str(VALID_OID)
 
-# Mock MongoDB before importing app
-@pytest.fixture(autouse=True)
-def mock_mongodb():
-    with patch('app.database.motor_client') as mock_client:
-        mock_db = MagicMock()
-        mock_client.__getitem__ = MagicMock(return_value=mock_db)
-        yield mock_db
 
+def done(value):
+    """An already-resolved future, cheaper to await than an AsyncMock call."""
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
 
-@pytest.fixture
-def mock_db():
-    db = MagicMock()
-    
-    # Mock collections
-    db.articles = MagicMock()
-    db.feeds = MagicMock()
-    db.preferences = MagicMock()
-    
-    return db
+
+def resolves_to(value):
+    """side_effect for a plain mock method that callers await."""
+    return lambda *args, **kwargs: done(value)
+
+
+# Mock setups: each configures only the collection methods its endpoint calls
+
+def no_preferences(db):
+    db.preferences.find_one.side_effect = resolves_to(None)
+
+
+def custom_preferences(db):
+    db.preferences.find_one.side_effect = resolves_to({
+        "interests": ["Python"],
+        "exclude_topics": ["Crypto"],
+        "min_relevance_score": 7,
+        "dark_mode": True,
+        "prune_after_days": 90,
+        "updated_at": datetime.now()
+    })
+
+
+def preferences_update(db):
+    db.preferences.update_one.return_value = None
+
+
+def existing_article(db):
+    db.articles.find_one_and_update.return_value = {"_id": VALID_OID}
+
+
+def new_feed(db):
+    db.feeds.find_one.side_effect = resolves_to(None)  # No existing feed
+    db.feeds.insert_one.return_value = SimpleNamespace(inserted_id=VALID_OID)
+
+
+def existing_feed(db):
+    db.feeds.find_one.side_effect = resolves_to({"url": "https://example.com/rss"})
+
+
+def no_db(db):
+    pass
 
 
 class TestHealthEndpoint:
-    @pytest.mark.asyncio
-    async def test_health_check(self, mock_mongodb):
+    async def test_health_check(self, client):
         """Test that health endpoint returns healthy status."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_get_db.return_value = mock_mongodb
-            
-            # Import app after mocking
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.get("/health")
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert data["status"] == "healthy"
-                assert "timestamp" in data
-
-
-class TestPreferencesAPI:
-    @pytest.mark.asyncio
-    async def test_get_preferences_default(self, mock_mongodb):
-        """Test getting preferences when none exist."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_db = MagicMock()
-            mock_db.preferences.find_one = AsyncMock(return_value=None)
-            mock_get_db.return_value = mock_db
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.get("/api/preferences")
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert "interests" in data
-                assert "dark_mode" in data
-                assert "prune_after_days" in data
-                assert data["prune_after_days"] == 30  # Default value
-    
-    @pytest.mark.asyncio
-    async def test_update_preferences(self, mock_mongodb):
-        """Test updating preferences."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_db = MagicMock()
-            mock_db.preferences.update_one = AsyncMock()
-            mock_get_db.return_value = mock_db
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.put(
-                    "/api/preferences",
-                    json={"dark_mode": True}
-                )
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert data["success"] is True
-    
-    @pytest.mark.asyncio
-    async def test_update_preferences_with_prune_days(self, mock_mongodb):
-        """Test updating preferences with prune_after_days."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_db = MagicMock()
-            mock_db.preferences.update_one = AsyncMock()
-            mock_get_db.return_value = mock_db
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.put(
-                    "/api/preferences",
-                    json={"prune_after_days": 60}
-                )
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert data["success"] is True
-    
-    @pytest.mark.asyncio
-    async def test_get_preferences_with_custom_prune_days(self, mock_mongodb):
-        """Test getting preferences with custom prune_after_days."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_db = MagicMock()
-            mock_db.preferences.find_one = AsyncMock(return_value={
-                "interests": ["Python"],
-                "exclude_topics": ["Crypto"],
-                "min_relevance_score": 7,
-                "dark_mode": True,
-                "prune_after_days": 90,
-                "updated_at": datetime.now()
-            })
-            mock_get_db.return_value = mock_db
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.get("/api/preferences")
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert data["prune_after_days"] == 90
-
-
-class TestArticlesAPI:
-    @pytest.mark.asyncio
-    async def test_mark_article_read_invalid_id(self, mock_mongodb):
-        """Test marking article read with invalid ID format."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_get_db.return_value = mock_mongodb
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.patch(
-                    "/api/articles/invalid-id/read?is_read=true"
-                )
-                
-                assert response.status_code == 400
-                data = response.json()
-                assert "Invalid article ID" in data["detail"]
-    
-    @pytest.mark.asyncio
-    async def test_mark_article_read_valid_id(self, mock_mongodb):
-        """Test marking article read with valid ID."""
-        valid_oid = str(ObjectId())
+        response = await client.get("/health")
         
-        with patch('app.database.get_database') as mock_get_db:
-            mock_db = MagicMock()
-            mock_result = MagicMock()
-            mock_result.matched_count = 1
-            mock_db.articles.update_one = AsyncMock(return_value=mock_result)
-            mock_get_db.return_value = mock_db
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.patch(
-                    f"/api/articles/{valid_oid}/read?is_read=true"
-                )
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert data["success"] is True
-                assert data["is_read"] is True
-
-
-class TestFeedsAPI:
-    @pytest.mark.asyncio
-    async def test_create_feed(self, mock_mongodb):
-        """Test creating a new feed."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_db = MagicMock()
-            mock_db.feeds.find_one = AsyncMock(return_value=None)  # No existing feed
-            mock_result = MagicMock()
-            mock_result.inserted_id = ObjectId()
-            mock_db.feeds.insert_one = AsyncMock(return_value=mock_result)
-            mock_get_db.return_value = mock_db
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.post(
-                    "/api/feeds",
-                    json={
-                        "url": "https://example.com/rss",
-                        "name": "Test Feed"
-                    }
-                )
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert data["name"] == "Test Feed"
-                assert data["enabled"] is True
-    
-    @pytest.mark.asyncio
-    async def test_create_duplicate_feed(self, mock_mongodb):
-        """Test creating a feed that already exists."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_db = MagicMock()
-            mock_db.feeds.find_one = AsyncMock(return_value={"url": "https://example.com/rss"})
-            mock_get_db.return_value = mock_db
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.post(
-                    "/api/feeds",
-                    json={
-                        "url": "https://example.com/rss",
-                        "name": "Test Feed"
-                    }
-                )
-                
-                assert response.status_code == 400
-                data = response.json()
-                assert "already exists" in data["detail"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert "timestamp" in data
+
+
+class TestAPIEndpoints:
+    @pytest.mark.parametrize("method,url,payload,mock_setup,expected_status,expected_json", [
+        pytest.param(
+            "GET", "/api/preferences", None, no_preferences, 200,
+            {"interests": ANY, "dark_mode": ANY, "prune_after_days": 30},  # Default value
+            id="get-preferences-default"
+        ),
+        pytest.param(
+            "PUT", "/api/preferences", {"dark_mode": True}, preferences_update, 200,
+            {"success": True},
+            id="update-preferences"
+        ),
+        pytest.param(
+            "PUT", "/api/preferences", {"prune_after_days": 60}, preferences_update, 200,
+            {"success": True},
+            id="update-preferences-prune-days"
+        ),
+        pytest.param(
+            "GET", "/api/preferences", None, custom_preferences, 200,
+            {"prune_after_days": 90},
+            id="get-preferences-custom-prune-days"
+        ),
+        pytest.param(
+            "PATCH", "/api/articles/invalid-id/read?is_read=true", None, no_db, 400,
+            {"detail": "Invalid article ID format"},
+            id="mark-read-invalid-id"
+        ),
+        pytest.param(
+            "PATCH", f"/api/articles/{VALID_OID_STR}/read?is_read=true", None, existing_article, 200,
+            {"success": True, "is_read": True},
+            id="mark-read-valid-id"
+        ),
+        pytest.param(
+            "POST", "/api/feeds", {"url": "https://example.com/rss", "name": "Test Feed"}, new_feed, 200,
+            {"name": "Test Feed", "enabled": True},
+            id="create-feed"
+        ),
+        pytest.param(
+            "POST", "/api/feeds", {"url": "https://example.com/rss", "name": "Test Feed"}, existing_feed, 400,
+            {"detail": "Feed already exists"},
+            id="create-duplicate-feed"
+        ),
+        pytest.param(
+            "DELETE", "/api/feeds/invalid-id", None, no_db, 400,
+            {"detail": "Invalid feed ID format"},
+            id="delete-feed-invalid-id"
+        ),
+    ])
+    async def test_endpoint(
+        self, client, mock_db, method, url, payload, mock_setup, expected_status, expected_json
+    ):
+        """Test an endpoint's status code and the response fields it must return."""
+        mock_setup(mock_db)
+        
+        response = await client.request(method, url, json=payload)
+        
+        assert response.status_code == expected_status
+        data = response.json()
+        for key, value in expected_json.items():
+            assert data[key] == value
+
+
+class TestDeleteArticlesBySource:
+    async def test_deletes_all_batches_and_sums_the_count(self, fake_collection):
+        """Test that a feed with several batches of articles is fully deleted and counted."""
+        count = FEED_DELETE_BATCH_SIZE * 2 + 500
+        feed_articles = [{"_id": ObjectId(), "source": "Feed"} for _ in range(count)]
+        other_articles = [{"_id": ObjectId(), "source": "Other"} for _ in range(10)]
+        articles = fake_collection(feed_articles + other_articles)
+        
+        deleted = await _delete_articles_by_source(SimpleNamespace(articles=articles), "Feed")
+        
+        assert deleted == count
+        assert articles.delete_calls == 3
+        assert articles.docs == other_articles
     
-    @pytest.mark.asyncio
-    async def test_delete_feed_invalid_id(self, mock_mongodb):
-        """Test deleting feed with invalid ID format."""
-        with patch('app.database.get_database') as mock_get_db:
-            mock_get_db.return_value = mock_mongodb
-            
-            from app.main import app
-            
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.delete("/api/feeds/invalid-id")
-                
-                assert response.status_code == 400
-                data = response.json()
-                assert "Invalid feed ID" in data["detail"]
+    async def test_no_articles(self, fake_collection):
+        """Test that a feed without articles returns 0 without deleting anything."""
+        articles = fake_collection([{"_id": ObjectId(), "source": "Other"}])
+        
+        assert await _delete_articles_by_source(SimpleNamespace(articles=articles), "Feed") == 0
+        assert articles.delete_calls == 0
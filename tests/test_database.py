@@ -0,0 +1,68 @@
+"""Tests for index sync."""
+from unittest.mock import AsyncMock, MagicMock
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from app.database import _sync_indexes
+
+ID_INDEX = {"_id_": {"key": [("_id", 1)], "v": 2}}
+
+URL_INDEX = IndexModel([("url", ASCENDING)], unique=True)
+STARRED_INDEX = IndexModel(
+    [("published_at", DESCENDING)],
+    partialFilterExpression={"is_starred": True},
+    name="starred_by_date"
+)
+LEGACY_INDEX = IndexModel([("source", ASCENDING)])
+
+
+def collection_with(indexes: dict) -> MagicMock:
+    collection = MagicMock()
+    collection.name = "articles"
+    collection.index_information = AsyncMock(return_value={**ID_INDEX, **indexes})
+    collection.drop_index = AsyncMock()
+    collection.create_indexes = AsyncMock()
+    return collection
+
+
+class TestSyncIndexes:
+    async def test_creates_missing_indexes(self):
+        """Test that missing indexes are created in one call and counted."""
+        collection = collection_with({})
+        
+        assert await _sync_indexes(collection, [URL_INDEX, STARRED_INDEX]) == 2
+        collection.create_indexes.assert_awaited_once_with([URL_INDEX, STARRED_INDEX])
+        collection.drop_index.assert_not_awaited()
+    
+    async def test_equivalent_index_under_another_name_counts_as_present(self):
+        """Test that indexes are matched by key spec and partial filter, not by name."""
+        collection = collection_with({
+            "url_unique": {"key": [("url", 1)], "unique": True},
+            "starred": {"key": [("published_at", -1)], "partialFilterExpression": {"is_starred": True}},
+        })
+        
+        assert await _sync_indexes(collection, [URL_INDEX, STARRED_INDEX]) == 0
+        collection.create_indexes.assert_not_awaited()
+    
+    async def test_partial_filter_distinguishes_indexes(self):
+        """Test that a full index on the same key doesn't stand in for a partial one."""
+        collection = collection_with({"published_at_-1": {"key": [("published_at", -1)]}})
+        
+        assert await _sync_indexes(collection, [STARRED_INDEX]) == 1
+        collection.create_indexes.assert_awaited_once_with([STARRED_INDEX])
+    
+    async def test_drops_only_legacy_indexes(self):
+        """Test that undeclared operator indexes survive and only legacy key specs are dropped."""
+        collection = collection_with({
+            "url_1": {"key": [("url", 1)], "unique": True},
+            "ops_title": {"key": [("title", 1)]},
+            "old_source": {"key": [("source", 1)]},
+        })
+        
+        await _sync_indexes(collection, [URL_INDEX], [LEGACY_INDEX])
+        collection.drop_index.assert_awaited_once_with("old_source")
+    
+    async def test_no_legacy_list_drops_nothing(self):
+        """Test that collections without legacy models never lose indexes."""
+        collection = collection_with({"source_1": {"key": [("source", 1)]}})
+        
+        await _sync_indexes(collection, [URL_INDEX])
+        collection.drop_index.assert_not_awaited()
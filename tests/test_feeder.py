@@ -0,0 +1,299 @@
+"""Tests for RSS feed parsing and entry extraction."""
+import asyncio
+import feedparser
+import pytest
+from bs4 import BeautifulSoup
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import BulkWriteError
+from datetime import datetime, timedelta, timezone
+from app.services.feeder import RSSFeeder
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"
+     xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel>
+  <title>Example</title>
+  <link>https://example.com/</link>
+  <item>
+    <title>With link</title>
+    <link>https://example.com/a</link>
+    <guid isPermaLink="false">id-1</guid>
+    <description>&lt;p&gt;Hello &lt;b&gt;world&lt;/b&gt;&lt;/p&gt;</description>
+    <pubDate>Tue, 01 Oct 2024 10:00:00 GMT</pubDate>
+  </item>
+  <item>
+    <title>Permalink guid only</title>
+    <guid isPermaLink="true">https://example.com/b</guid>
+    <description>B text</description>
+    <dc:date>2024-10-02T10:00:00Z</dc:date>
+  </item>
+  <item>
+    <title>Guid without isPermaLink</title>
+    <guid>https://example.com/c</guid>
+    <content:encoded><![CDATA[<p>C body</p>]]></content:encoded>
+  </item>
+  <item>
+    <title>No link at all</title>
+    <guid isPermaLink="false">id-4</guid>
+    <description>D text</description>
+  </item>
+</channel>
+</rss>"""
+
+RDF_FEED = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.com/">
+    <title>Example</title>
+    <link>https://example.com/</link>
+  </channel>
+  <item rdf:about="https://example.com/r1">
+    <title>RDF item</title>
+    <link>https://example.com/r1</link>
+    <description>R1 text</description>
+    <dc:date>2024-10-03T08:30:00+02:00</dc:date>
+  </item>
+</rdf:RDF>"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example</title>
+  <id>urn:example</id>
+  <updated>2024-10-04T00:00:00Z</updated>
+  <entry>
+    <title>Alternate link</title>
+    <link rel="self" href="https://example.com/self"/>
+    <link rel="alternate" href="https://example.com/e1"/>
+    <id>urn:1</id>
+    <updated>2024-10-04T00:00:00Z</updated>
+    <summary>S1 text</summary>
+  </entry>
+  <entry>
+    <title>XHTML content</title>
+    <link href="https://example.com/e2"/>
+    <id>urn:2</id>
+    <published>2024-10-05T00:00:00Z</published>
+    <content type="xhtml">
+      <div xmlns="http://www.w3.org/1999/xhtml"><p>X <b>bold</b></p></div>
+    </content>
+  </entry>
+  <entry>
+    <title>Several alternates</title>
+    <link rel="alternate" type="text/html" href="https://example.com/e3"/>
+    <link rel="alternate" type="text/html" hreflang="de" href="https://example.com/de/e3"/>
+    <link rel="alternate" type="application/pdf" href="https://example.com/e3.pdf"/>
+    <id>urn:3</id>
+    <updated>2024-10-06T00:00:00Z</updated>
+    <summary>S3 text</summary>
+  </entry>
+</feed>"""
+
+
+@pytest.fixture
+def feeder():
+    return RSSFeeder()
+
+
+def extract_all(feeder, entries) -> list[dict]:
+    return [feeder._extract_entry(entry, NOW) for entry in entries]
+
+
+class TestParseFeed:
+    @pytest.mark.parametrize("document", [RSS_FEED, RDF_FEED, ATOM_FEED], ids=["rss2", "rdf", "atom"])
+    def test_matches_feedparser(self, feeder, document):
+        """Test that the lxml fast path extracts the same articles as feedparser."""
+        fast = extract_all(feeder, RSSFeeder._parse_feed(document, "Example"))
+        reference = extract_all(feeder, feedparser.parse(document).entries)
+        assert fast == reference
+    
+    def test_permalink_guid_used_as_url(self, feeder):
+        """Test that items with only a permalink guid get that guid as their URL."""
+        urls = [c["url"] for c in extract_all(feeder, RSSFeeder._parse_feed(RSS_FEED, "Example"))]
+        assert urls == ["https://example.com/a", "https://example.com/b", "https://example.com/c", ""]
+    
+    def test_atom_prefers_alternate_link(self, feeder):
+        """Test that Atom entries use the rel=alternate link, not rel=self."""
+        entries = RSSFeeder._parse_feed(ATOM_FEED, "Example")
+        assert entries[0]["link"] == "https://example.com/e1"
+    
+    def test_several_alternates_pick_feedparsers_link(self, feeder):
+        """Test that with several alternates the link is the one feedparser picks: the last HTML one."""
+        fast = RSSFeeder._parse_feed(ATOM_FEED, "Example")[2]["link"]
+        assert fast == feedparser.parse(ATOM_FEED).entries[2].link == "https://example.com/de/e3"
+    
+    def test_malformed_xml_falls_back_to_feedparser(self):
+        """Test that documents lxml rejects are still parsed leniently."""
+        broken = RSS_FEED.replace(b"</channel>", b"")
+        entries = RSSFeeder._parse_feed(broken, "Example")
+        assert [e["title"] for e in entries][:2] == ["With link", "Permalink guid only"]
+
+
+class TestExtractEntries:
+    def test_skips_entries_without_link(self, feeder):
+        """Test that linkless entries are dropped instead of being keyed on ''."""
+        entries = RSSFeeder._parse_feed(RSS_FEED, "Example")
+        candidates = feeder._extract_entries(entries, "Example", NOW)
+        assert list(candidates) == [
+            "https://example.com/a", "https://example.com/b", "https://example.com/c"
+        ]
+    
+    def test_keeps_first_duplicate(self, feeder):
+        """Test that a link repeated in one feed yields a single candidate."""
+        entries = [
+            {"link": "https://example.com/a", "title": "First"},
+            {"link": "https://example.com/a", "title": "Second"},
+        ]
+        candidates = feeder._extract_entries(entries, "Example", NOW)
+        assert candidates["https://example.com/a"]["title"] == "First"
+
+
+class TestParseDate:
+    @pytest.mark.parametrize("date_str,expected", [
+        ("2024-10-01T10:00:00+00:00", datetime(2024, 10, 1, 10, tzinfo=timezone.utc)),
+        ("2024-10-01T10:00:00Z", datetime(2024, 10, 1, 10, tzinfo=timezone.utc)),
+        ("Tue, 01 Oct 2024 10:00:00 GMT", datetime(2024, 10, 1, 10, tzinfo=timezone.utc)),
+        (
+            "Tue, 01 Oct 2024 12:00:00 +0200",
+            datetime(2024, 10, 1, 12, tzinfo=timezone(timedelta(hours=2)))
+        ),
+        ("October 1, 2024 10:00", datetime(2024, 10, 1, 10)),
+        ("", None),
+        ("not a date", None),
+    ], ids=["iso-offset", "iso-z", "rfc822-gmt", "rfc822-offset", "dateutil-fallback", "empty", "garbage"])
+    def test_parse_date(self, date_str, expected):
+        """Test that ISO-8601, RFC-822 and free-form dates parse, and junk yields None."""
+        assert RSSFeeder._parse_date(date_str) == expected
+
+
+class TestCleanHtml:
+    CASES = [
+        ("<p>Hello <b>world</b></p>", "Hello world"),
+        ('<?xml version="1.0" encoding="UTF-8"?><p>Hello <b>world</b></p>', "Hello world"),
+        ("<p>Hi</p><script>alert(1)</script><style>p {}</style><p>there</p>", "Hi there"),
+        ("<p>a<script>x</script>b</p>", "a b"),
+        ("<template>t</template>ok", "ok"),
+        ("<p>Hi<!-- hidden -->there</p>", "Hi there"),
+        ("<![CDATA[x]]>hi", "x hi"),
+        ("<![CDATA[a <b> & c]]> d", "a <b> & c d"),
+        ("Just text", "Just text"),
+        ("   ", ""),
+        ("", ""),
+    ]
+    IDS = [
+        "markup", "xml-declaration", "script-style", "script-inline", "template", "comment",
+        "cdata", "cdata-markup", "plain-text", "whitespace", "empty",
+    ]
+    
+    @pytest.mark.parametrize("html,expected", CASES, ids=IDS)
+    def test_clean_html(self, html, expected):
+        """Test that entry HTML is reduced to its visible text."""
+        assert RSSFeeder._clean_html(html) == expected
+    
+    @pytest.mark.filterwarnings("ignore::bs4.XMLParsedAsHTMLWarning")
+    @pytest.mark.parametrize("html,expected", CASES, ids=IDS)
+    def test_matches_beautifulsoup(self, html, expected):
+        """Test that the lxml path returns what BeautifulSoup's get_text did."""
+        soup = BeautifulSoup(html, "html.parser")
+        assert RSSFeeder._clean_html(html) == soup.get_text(separator=" ", strip=True)
+
+class TestWriteArticles:
+    ARTICLES = [{"url": f"https://example.com/{i}", "title": f"A{i}", "relevance_score": 5} for i in range(4)]
+    
+    def feeder_with_insert(self, insert_many) -> RSSFeeder:
+        feeder = RSSFeeder()
+        feeder.db = MagicMock()
+        feeder.db.articles.insert_many = insert_many
+        return feeder
+    
+    async def test_counts_all_inserted(self):
+        """Test that a clean unordered insert counts every article as new."""
+        insert_many = AsyncMock()
+        feeder = self.feeder_with_insert(insert_many)
+        
+        assert await feeder._write_articles(self.ARTICLES) == 4
+        insert_many.assert_awaited_once_with(self.ARTICLES, ordered=False)
+    
+    async def test_duplicates_are_benign(self):
+        """Test that duplicate-key errors only reduce the count of new articles."""
+        error = BulkWriteError({"writeErrors": [
+            {"index": 1, "code": 11000, "errmsg": "E11000 duplicate key"},
+            {"index": 3, "code": 11000, "errmsg": "E11000 duplicate key"},
+        ]})
+        feeder = self.feeder_with_insert(AsyncMock(side_effect=error))
+        
+        assert await feeder._write_articles(self.ARTICLES) == 2
+    
+    async def test_other_write_errors_propagate(self):
+        """Test that a write error other than a duplicate key is raised, even next to duplicates."""
+        error = BulkWriteError({"writeErrors": [
+            {"index": 0, "code": 11000, "errmsg": "E11000 duplicate key"},
+            {"index": 2, "code": 121, "errmsg": "Document failed validation"},
+        ]})
+        feeder = self.feeder_with_insert(AsyncMock(side_effect=error))
+        
+        with pytest.raises(BulkWriteError):
+            await feeder._write_articles(self.ARTICLES)
+    
+    async def test_empty_batch_skips_the_insert(self):
+        """Test that nothing is sent for an empty batch."""
+        insert_many = AsyncMock()
+        feeder = self.feeder_with_insert(insert_many)
+        
+        assert await feeder._write_articles([]) == 0
+        insert_many.assert_not_awaited()
+
+
+class FeedCursor:
+    """Async cursor over feed documents that can fail after a number of documents."""
+    
+    def __init__(self, feeds: list[dict], fail_after: int | None = None):
+        self.feeds = feeds
+        self.fail_after = fail_after
+    
+    def __aiter__(self):
+        return self._documents()
+    
+    async def _documents(self):
+        for index, feed in enumerate(self.feeds):
+            await asyncio.sleep(0)  # Like a real cursor, let started fetches run
+            if index == self.fail_after:
+                raise RuntimeError("cursor died")
+            yield feed
+
+
+class TestFetchAllEnabledFeeds:
+    FEEDS = [{"url": f"https://example.com/{i}.xml", "name": f"Feed {i}"} for i in range(3)]
+    
+    def feeder_with(self, cursor: FeedCursor, fetch_feed) -> RSSFeeder:
+        feeder = RSSFeeder()
+        feeder.db = MagicMock()
+        feeder.db.feeds.find.return_value = cursor
+        feeder.fetch_feed = fetch_feed
+        return feeder
+    
+    async def test_sums_new_articles_and_isolates_errors(self):
+        """Test that results are summed and one failing feed doesn't stop the others."""
+        async def fetch_feed(url, name):
+            if name == "Feed 1":
+                raise ValueError("boom")
+            return 2
+        
+        feeder = self.feeder_with(FeedCursor(self.FEEDS), fetch_feed)
+        assert await feeder.fetch_all_enabled_feeds() == 4
+    
+    async def test_cursor_failure_cancels_started_fetches(self):
+        """Test that fetches started before a cursor error are cancelled, not orphaned."""
+        started: list[asyncio.Task] = []
+        
+        async def fetch_feed(url, name):
+            started.append(asyncio.current_task())
+            await asyncio.sleep(10)
+            return 1
+        
+        feeder = self.feeder_with(FeedCursor(self.FEEDS, fail_after=2), fetch_feed)
+        assert await feeder.fetch_all_enabled_feeds() == 0
+        
+        assert len(started) == 2
+        assert all(task.cancelled() for task in started)
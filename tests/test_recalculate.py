@@ -0,0 +1,191 @@
+"""Tests for score recalculation."""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.main import (
+    RECALCULATE_BATCH_SIZE, RECALCULATE_CURSOR_BATCH_SIZE,
+    _compile_topic_pattern, _flush_article_updates, _prefilter_article, recalculate_all_scores
+)
+from app.services.ai_processor import SUMMARY_FAILED, SUMMARY_OFFLINE, ai_processor
+
+ARTICLE_ID = ObjectId()
+
+
+def article(title: str, summary: str = "") -> dict:
+    return {"_id": ARTICLE_ID, "title": title, "summary": summary}
+
+
+def score_update(score: int, is_hidden: bool) -> UpdateOne:
+    return UpdateOne(
+        {"_id": ARTICLE_ID},
+        {"$set": {"tags": [], "relevance_score": score, "is_hidden": is_hidden}}
+    )
+
+
+class TestCompileTopicPattern:
+    def test_no_topics(self):
+        """Test that an empty or blank topic list yields no pattern."""
+        assert _compile_topic_pattern([]) is None
+        assert _compile_topic_pattern(["", "  "]) is None
+    
+    @pytest.mark.parametrize("topic,text", [
+        ("Python", "New python release"),
+        ("C++", "New C++ standard"),
+        ("C#", "What's new in C# 13"),
+        (".NET", "Microsoft ships .NET 9"),
+        ("AI", "AI: the year in review"),
+    ])
+    def test_matches_whole_topic(self, topic, text):
+        """Test that topics match case-insensitively, including ones with symbols."""
+        assert _compile_topic_pattern([topic]).search(text)
+    
+    @pytest.mark.parametrize("topic,text", [
+        ("AI", "Email providers"),
+        ("Go", "Google announces"),
+    ])
+    def test_ignores_partial_words(self, topic, text):
+        """Test that a topic embedded in a longer word doesn't match."""
+        assert _compile_topic_pattern([topic]).search(text) is None
+
+
+class TestPrefilterArticle:
+    exclude_re = _compile_topic_pattern(["Crypto"])
+    
+    def prefilter(self, doc: dict):
+        return _prefilter_article(doc, self.exclude_re, min_score=5)
+    
+    def test_excluded_title_scores_zero(self):
+        """Test that an excluded topic in the title scores 0 and hides the article."""
+        assert self.prefilter(article("Crypto prices soar")) == score_update(0, True)
+    
+    @pytest.mark.parametrize("doc", [
+        article("Gardening tips", "How to grow tomatoes."),
+        article("LLMs get faster", "Inference costs keep falling."),
+        article("New C++ standard"),
+        article("Market update", "Crypto is only mentioned in the summary."),
+    ], ids=["no-keyword", "semantic-match", "keyword", "excluded-in-summary"])
+    def test_other_articles_need_ai(self, doc):
+        """Test that only an excluded title skips the AI, so earlier AI tags and scores survive."""
+        assert self.prefilter(doc) is None
+    
+    @pytest.mark.parametrize("summary", [SUMMARY_FAILED, SUMMARY_OFFLINE])
+    def test_fallback_summary_needs_ai(self, summary):
+        """Test that articles whose earlier analysis failed are re-analyzed."""
+        assert self.prefilter(article("Crypto prices soar", summary)) is None
+    
+    def test_no_exclusions_needs_ai(self):
+        """Test that without exclusions every article goes to the AI."""
+        assert _prefilter_article(article("Crypto prices soar"), None, min_score=5) is None
+
+
+class ArticleCursor:
+    """Async cursor over article documents that records the requested batch size."""
+    
+    def __init__(self, articles: list[dict]):
+        self.articles = articles
+        self.requested_batch_size = None
+    
+    def batch_size(self, size: int):
+        self.requested_batch_size = size
+        return self
+    
+    def __aiter__(self):
+        return self._documents()
+    
+    async def _documents(self):
+        for doc in self.articles:
+            yield doc
+
+
+def articles_db(articles: list[dict]) -> MagicMock:
+    db = MagicMock()
+    db.articles.find.return_value = ArticleCursor(articles)
+    db.articles.bulk_write = AsyncMock(
+        side_effect=lambda operations, ordered: SimpleNamespace(matched_count=len(operations))
+    )
+    return db
+
+
+def bulk_write_error(matched: int, errors: int) -> BulkWriteError:
+    return BulkWriteError({
+        "nMatched": matched,
+        "writeErrors": [{"index": i, "code": 2, "errmsg": "bad update"} for i in range(errors)]
+    })
+
+
+class TestFlushArticleUpdates:
+    async def test_returns_matched_count(self):
+        """Test that one unordered bulk write is issued and its matched count returned."""
+        db = articles_db([])
+        operations = [score_update(1, True)] * 3
+        
+        assert await _flush_article_updates(db, operations) == 3
+        db.articles.bulk_write.assert_awaited_once_with(operations, ordered=False)
+    
+    async def test_empty_batch_skips_the_write(self):
+        """Test that nothing is sent when there is nothing to flush."""
+        db = articles_db([])
+        
+        assert await _flush_article_updates(db, []) == 0
+        db.articles.bulk_write.assert_not_awaited()
+    
+    async def test_partial_failure_counts_applied_updates(self):
+        """Test that a BulkWriteError still reports the updates that were applied."""
+        db = articles_db([])
+        db.articles.bulk_write.side_effect = bulk_write_error(matched=7, errors=3)
+        
+        assert await _flush_article_updates(db, [score_update(1, True)] * 10) == 7
+    
+    async def test_other_errors_count_nothing(self):
+        """Test that an unexpected write error is logged and counted as zero."""
+        db = articles_db([])
+        db.articles.bulk_write.side_effect = RuntimeError("connection reset")
+        
+        assert await _flush_article_updates(db, [score_update(1, True)]) == 0
+
+
+class TestRecalculateAllScores:
+    PREFERENCES = {"interests": ["Python"], "exclude_topics": ["Crypto"], "min_relevance_score": 5}
+    
+    async def recalculate(self, db: MagicMock) -> tuple[dict, AsyncMock]:
+        process_article = AsyncMock(return_value={"summary": "S.", "tags": [], "relevance_score": 5})
+        with patch("app.main.get_prefs_cached", AsyncMock(return_value=self.PREFERENCES)), \
+                patch.object(ai_processor, "process_article", process_article):
+            return await recalculate_all_scores(db), process_article
+    
+    async def test_flushes_every_batch_size_updates(self):
+        """Test that updates are written in RECALCULATE_BATCH_SIZE bulk writes plus a final remainder."""
+        count = RECALCULATE_BATCH_SIZE * 2 + 250
+        db = articles_db([{"_id": ObjectId(), "title": f"Article {i}"} for i in range(count)])
+        
+        result, _ = await self.recalculate(db)
+        
+        flushed = [len(call.args[0]) for call in db.articles.bulk_write.await_args_list]
+        assert flushed == [RECALCULATE_BATCH_SIZE, RECALCULATE_BATCH_SIZE, 250]
+        assert result["processed_count"] == count
+        assert db.articles.find.return_value.requested_batch_size == RECALCULATE_CURSOR_BATCH_SIZE
+    
+    async def test_excluded_titles_skip_the_ai(self):
+        """Test that pre-filtered articles are written without an AI call."""
+        db = articles_db([
+            {"_id": ObjectId(), "title": "Crypto prices soar"},
+            {"_id": ObjectId(), "title": "Python 3.13 released"},
+        ])
+        
+        result, process_article = await self.recalculate(db)
+        
+        assert result["processed_count"] == 2
+        process_article.assert_awaited_once()
+        assert process_article.await_args.args[0] == "Python 3.13 released"
+    
+    async def test_partial_bulk_failure_reduces_processed_count(self):
+        """Test that a partially failing flush only counts the updates that were applied."""
+        db = articles_db([{"_id": ObjectId(), "title": f"Article {i}"} for i in range(10)])
+        db.articles.bulk_write.side_effect = bulk_write_error(matched=8, errors=2)
+        
+        result, _ = await self.recalculate(db)
+        
+        assert result["processed_count"] == 8
@@ -0,0 +1,41 @@
+"""Tests for scheduled jobs."""
+import logging
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from app.services.scheduler import CLEANUP_BATCH_SIZE, cleanup_old_articles
+
+
+def old_article(days: int, is_starred: bool = False) -> dict:
+    created_at = datetime.now(timezone.utc) - timedelta(days=days)
+    return {"_id": ObjectId(), "is_starred": is_starred, "created_at": created_at}
+
+
+class TestCleanupOldArticles:
+    async def test_deletes_old_unstarred_articles_in_batches(self, fake_collection, caplog):
+        """Test that a backlog larger than one batch is fully pruned, keeping starred and recent articles."""
+        stale = [old_article(days=40) for _ in range(CLEANUP_BATCH_SIZE * 2 + 500)]
+        kept = [old_article(days=40, is_starred=True), old_article(days=1)]
+        db = MagicMock()
+        db.preferences.find_one = AsyncMock(return_value={"prune_after_days": 30})
+        db.articles = fake_collection(stale + kept)
+        
+        with patch("app.services.scheduler.get_database", return_value=db), \
+                caplog.at_level(logging.INFO, logger="app.services.scheduler"):
+            await cleanup_old_articles()
+        
+        assert db.articles.docs == kept
+        assert db.articles.delete_calls == 3
+        assert f"Deleted {len(stale)} old articles" in caplog.text
+    
+    async def test_nothing_to_delete(self, fake_collection):
+        """Test that the loop stops immediately when no article is old enough."""
+        db = MagicMock()
+        db.preferences.find_one = AsyncMock(return_value=None)  # Default of 30 days
+        db.articles = fake_collection([old_article(days=1)])
+        
+        with patch("app.services.scheduler.get_database", return_value=db):
+            await cleanup_old_articles()
+        
+        assert db.articles.delete_calls == 0
+        assert len(db.articles.docs) == 1